@@ -21,6 +21,7 @@ from aria.consent import ARIAConsent, TaskType
 from aria.api import ARIAOpenAIServer
 from aria.dashboard import ARIADashboard
 from aria.model_manager import ModelManager, SUPPORTED_MODELS
+from aria.network import install_uvloop
 
 # State file for tracking running node
 STATE_DIR = Path.home() / ".aria"
@@ -1312,6 +1313,9 @@ def main():
         parser.parse_args(["ledger", "--help"])
         return 0
 
+    # Faster event loop for all commands when uvloop is installed
+    install_uvloop()
+
     # Execute the command
     if hasattr(args, "func"):
         return args.func(args)
@@ -10,7 +10,7 @@ import json
 import hashlib
 import time
 from dataclasses import dataclass, field, asdict
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 from enum import Enum
 
 
@@ -24,6 +24,25 @@ class TaskType(Enum):
     ANY = "any"
 
 
+# One bit per task type, so compiled consents check task types with a single AND
+_TASK_BITS = {task_type: 1 << i for i, task_type in enumerate(TaskType)}
+
+_DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _in_schedule(now: time.struct_time, days, start_minutes: int,
+                 end_minutes: int) -> bool:
+    """Check a UTC time against a day list and a daily minute window."""
+    if _DAY_NAMES[now.tm_wday] not in days:
+        return False
+
+    current_minutes = now.tm_hour * 60 + now.tm_min
+    if end_minutes > start_minutes:
+        return start_minutes <= current_minutes <= end_minutes
+    else:  # Overnight schedule (e.g., 22:00-06:00)
+        return current_minutes >= start_minutes or current_minutes <= end_minutes
+
+
 @dataclass
 class ARIAConsent:
     """
@@ -72,27 +91,14 @@ class ARIAConsent:
     
     def is_available_now(self) -> bool:
         """Check if the node is available based on schedule."""
-        now = time.gmtime()
-        
-        # Check day
-        day_names = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-        current_day = day_names[now.tm_wday]
-        if current_day not in self.days:
-            return False
-        
-        # Check time
+        return _in_schedule(time.gmtime(), self.days, *self._schedule_minutes())
+    
+    def _schedule_minutes(self) -> Tuple[int, int]:
+        """Parse the schedule into (start, end) minutes since midnight."""
         start_str, end_str = self.schedule.split("-")
         start_h, start_m = map(int, start_str.split(":"))
         end_h, end_m = map(int, end_str.split(":"))
-        
-        current_minutes = now.tm_hour * 60 + now.tm_min
-        start_minutes = start_h * 60 + start_m
-        end_minutes = end_h * 60 + end_m
-        
-        if end_minutes > start_minutes:
-            return start_minutes <= current_minutes <= end_minutes
-        else:  # Overnight schedule (e.g., 22:00-06:00)
-            return current_minutes >= start_minutes or current_minutes <= end_minutes
+        return start_h * 60 + start_m, end_h * 60 + end_m
     
     def accepts_task(self, task_type: TaskType) -> bool:
         """Check if this consent allows a given task type."""
@@ -122,6 +128,41 @@ class ARIAConsent:
         
         return True
     
+    def compile(self) -> Callable[..., bool]:
+        """
+        Snapshot this consent into a fast request predicate.
+        
+        The returned function behaves like matches_request(), but the
+        schedule is parsed and the accepted task types are folded into a
+        bitmask once, up front. It takes an optional ``now`` (a UTC
+        struct_time) so callers matching many consents can sample the
+        clock once. Later changes to this consent are not reflected.
+        """
+        days = frozenset(self.days)
+        start_minutes, end_minutes = self._schedule_minutes()
+        accepts_any = TaskType.ANY in self.task_types
+        task_mask = 0
+        for task_type in self.task_types:
+            task_mask |= _TASK_BITS[task_type]
+        max_ram_mb = self.max_ram_mb
+        min_contribution_score = self.min_contribution_score
+        
+        def matches(request: dict, now: Optional[time.struct_time] = None) -> bool:
+            if not _in_schedule(now or time.gmtime(), days,
+                                start_minutes, end_minutes):
+                return False
+            if not accepts_any:
+                task_type = request.get("task_type", TaskType.ANY)
+                if not _TASK_BITS.get(task_type, 0) & task_mask:
+                    return False
+            if request.get("ram_mb", 0) > max_ram_mb:
+                return False
+            if request.get("contribution_score", 0) < min_contribution_score:
+                return False
+            return True
+        
+        return matches
+    
     def to_hash(self) -> str:
         """Generate a unique hash of this consent for on-chain registration."""
         data = json.dumps(asdict(self), sort_keys=True, default=str)
@@ -17,19 +17,28 @@ Backend modes:
 MIT License - Anthony MURGO, 2026
 """
 
+import asyncio
 import hashlib
 import time
 import struct
 import math
-import base64
+import binascii
+import functools
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 from aria.ledger import InferenceRecord
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=64)
+def _float_struct(count: int) -> struct.Struct:
+    """Compiled struct for `count` native floats (hidden sizes repeat)."""
+    return struct.Struct(f'{count}f')
+
+
 def serialize_activations(activations: List[float]) -> str:
     """
     Serialize activations to a base64-encoded JSON string.
@@ -43,8 +52,8 @@ def serialize_activations(activations: List[float]) -> str:
     Returns:
         Base64-encoded string of packed floats
     """
-    packed = struct.pack(f'{len(activations)}f', *activations)
-    return base64.b64encode(packed).decode('ascii')
+    packed = _float_struct(len(activations)).pack(*activations)
+    return binascii.b2a_base64(packed, newline=False).decode('ascii')
 
 
 def deserialize_activations(encoded: str) -> List[float]:
@@ -57,9 +66,19 @@ def deserialize_activations(encoded: str) -> List[float]:
     Returns:
         List of float activation values
     """
-    packed = base64.b64decode(encoded.encode('ascii'))
+    packed = binascii.a2b_base64(encoded)
     num_floats = len(packed) // 4  # 4 bytes per float
-    return list(struct.unpack(f'{num_floats}f', packed))
+    return list(_float_struct(num_floats).unpack(packed))
+
+
+def provenance_hash(data: bytes) -> str:
+    """
+    Hex digest used for provenance query/output hashes.
+
+    SHA-256 through hashlib, which is backed by OpenSSL and uses the
+    CPU's SHA extensions where available.
+    """
+    return hashlib.sha256(data).hexdigest()
 
 
 @dataclass
@@ -183,9 +202,14 @@ class ModelShard:
         return self.layer_end - self.layer_start + 1
 
 
-@dataclass
+@dataclass(slots=True)
 class InferenceResult:
-    """Result of a distributed inference."""
+    """
+    Result of a distributed inference.
+
+    Slotted: one is created per request (and per batch entry), so
+    dropping the per-instance __dict__ saves memory and allocation.
+    """
     request_id: str
     output_tokens: List[int]    # Generated token IDs
     output_text: str            # Decoded text
@@ -196,10 +220,18 @@ class InferenceResult:
     tokens_generated: int       # Count of output tokens
     
     def to_provenance_record(self, query: str) -> InferenceRecord:
-        """Convert to a provenance record for the ledger."""
+        """
+        Convert to a provenance record for the ledger.
+
+        Query and output are hashed with provenance_hash, which every
+        node must share for records to match.
+
+        Args:
+            query: The original query text
+        """
         return InferenceRecord(
-            query_hash=hashlib.sha256(query.encode()).hexdigest(),
-            output_hash=hashlib.sha256(self.output_text.encode()).hexdigest(),
+            query_hash=provenance_hash(query.encode()),
+            output_hash=provenance_hash(self.output_text.encode()),
             model_id=self.model_id,
             node_ids=self.nodes_used,
             energy_mj=self.energy_mj,
@@ -275,6 +307,119 @@ class TernaryLayer:
         return ops * 0.000001  # millijoules
 
 
+class InferenceBatcher:
+    """
+    Coalesces concurrent inference requests into batches.
+
+    Requests are queued and a background task collects them until
+    ``batch_size`` are waiting or ``max_delay`` seconds have passed since
+    the first one arrived. Each batch runs in a worker thread, so the
+    event loop keeps serving the network while inference is in progress.
+
+    Usage:
+        batcher = InferenceBatcher(engine.infer_batch)
+        batcher.start()
+        result = await batcher.submit("What is AI?", "aria-2b-1bit", 100)
+        await batcher.stop()
+    """
+
+    def __init__(self, infer_batch: Callable[[List[Tuple[str, str, int]]], List[InferenceResult]],
+                 batch_size: int = 16, max_delay: float = 0.005):
+        """
+        Args:
+            infer_batch: Callable running a list of (query, model_id, max_tokens)
+            batch_size: Maximum requests per batch
+            max_delay: Seconds to wait for more requests after the first
+        """
+        self.infer_batch = infer_batch
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.batches_run = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def start(self):
+        """Start the batching worker on the running event loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and cancel requests that have not run yet."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def submit(self, query: str, model_id: str, max_tokens: int) -> InferenceResult:
+        """Queue a request and wait for its result."""
+        if self._worker is None:
+            raise RuntimeError("InferenceBatcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((query, model_id, max_tokens, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for one request, then gather more until full or timed out."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_delay
+
+        try:
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Stopped mid-collect: these requests have left the queue, so
+            # stop() cannot reach them
+            for *_, future in batch:
+                future.cancel()
+            raise
+
+        return batch
+
+    async def _run(self):
+        """Worker loop: collect a batch, run it off-loop, fan results out."""
+        while True:
+            batch = await self._collect()
+            requests = [(query, model_id, max_tokens)
+                        for query, model_id, max_tokens, _ in batch]
+
+            try:
+                results = await asyncio.to_thread(self.infer_batch, requests)
+            except asyncio.CancelledError:
+                for *_, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            for (*_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
 class InferenceEngine:
     """
     The ARIA distributed inference engine.
@@ -317,12 +462,18 @@ class InferenceEngine:
         self.backend = backend
         self.loaded_shards: Dict[str, ModelShard] = {}
         self.layers: Dict[str, List[TernaryLayer]] = {}  # model_id -> layers
+        # model_id -> (shard, per-layer energy), fixed at load time so a
+        # pipeline hop does no shard lookup or energy recomputation
+        self._stage_plans: Dict[str, Tuple[ModelShard, List[float]]] = {}
         self.total_inferences = 0
         self.total_energy_mj = 0.0
         self._bitnet = None  # Lazy-initialized BitNetNative instance
         self._subprocess_backend = None  # Lazy-initialized BitNetSubprocess instance
         self._active_backend = "simulation"  # Track which backend is active
 
+        # Guards engine state when batches run in a worker thread
+        self._lock = threading.RLock()
+
         # Initialize backends based on mode
         self._init_backends(backend, threads)
 
@@ -433,6 +584,9 @@ class InferenceEngine:
             checksum=hashlib.sha256(model_id.encode()).hexdigest()[:16],
         )
         self.loaded_shards[shard.shard_id] = shard
+        self._stage_plans[model_id] = (
+            shard, [layer.energy_estimate_mj() for layer in layers]
+        )
         
         return shard
     
@@ -463,16 +617,38 @@ class InferenceEngine:
         Returns:
             InferenceResult with output, timing, and energy data
         """
-        # Use subprocess backend for real inference if available
-        if self._active_backend == "subprocess" and self._subprocess_backend:
-            return self._infer_subprocess(query, model_id, max_tokens, temperature)
+        with self._lock:
+            # Use subprocess backend for real inference if available
+            if self._active_backend == "subprocess" and self._subprocess_backend:
+                return self._infer_subprocess(query, model_id, max_tokens, temperature)
+
+            # Use native DLL backend if available
+            if self._active_backend == "native" and self._bitnet:
+                return self._infer_native(query, model_id, max_tokens, temperature)
+
+            # Fall back to simulation
+            return self._infer_simulation(query, model_id, max_tokens)
+
+    def infer_batch(self, requests: List[Tuple[str, str, int]]) -> List[InferenceResult]:
+        """
+        Run several inference requests as one batch.
 
-        # Use native DLL backend if available
-        if self._active_backend == "native" and self._bitnet:
-            return self._infer_native(query, model_id, max_tokens, temperature)
+        This is the single entry point for batched execution. None of the
+        current backends exposes a batched kernel, so requests still run
+        one after another; a backend that can stack inputs into one
+        forward pass only needs to change this method.
 
-        # Fall back to simulation
-        return self._infer_simulation(query, model_id, max_tokens)
+        Args:
+            requests: List of (query, model_id, max_tokens) tuples
+
+        Returns:
+            One InferenceResult per request, in the same order
+        """
+        with self._lock:
+            return [
+                self.infer(query=query, model_id=model_id, max_tokens=max_tokens)
+                for query, model_id, max_tokens in requests
+            ]
 
     def _infer_subprocess(self, query: str, model_id: str,
                           max_tokens: int, temperature: float) -> InferenceResult:
@@ -664,15 +840,8 @@ class InferenceEngine:
         if not layers:
             raise ValueError(f"Model {model_id} not loaded on this node")
 
-        # Get our shard info
-        shard = None
-        for s in self.loaded_shards.values():
-            if s.model_id == model_id:
-                shard = s
-                break
-
-        if not shard:
-            raise ValueError(f"No shard loaded for model {model_id}")
+        # Shard and layer energies were fixed when the model was loaded
+        shard, layer_energy = self._stage_plans[model_id]
 
         # Check if this stage should process
         if state.current_layer > shard.layer_end:
@@ -686,19 +855,14 @@ class InferenceEngine:
                 f"this node has layers {shard.layer_start}-{shard.layer_end}"
             )
 
-        # Process through our local layers
+        # Process through our local layers. They are contiguous from
+        # shard.layer_start, so the remaining ones are a plain slice.
         activations = state.activations
-        total_energy = 0.0
-
-        # Only process layers within our shard that are at or after current_layer
-        for layer in layers:
-            if layer.layer_id < state.current_layer:
-                continue
-            if layer.layer_id > shard.layer_end:
-                break
+        first = state.current_layer - shard.layer_start
 
+        for layer in layers[first:]:
             activations = layer.forward(activations)
-            total_energy += layer.energy_estimate_mj()
+        total_energy = sum(layer_energy[first:], 0.0)
 
         # Update state
         new_state = PipelineState(
@@ -715,8 +879,9 @@ class InferenceEngine:
             originator_id=state.originator_id,
         )
 
-        self.total_inferences += 1
-        self.total_energy_mj += total_energy
+        with self._lock:
+            self.total_inferences += 1
+            self.total_energy_mj += total_energy
 
         # Check if we're the final stage
         if new_state.is_complete:
@@ -744,10 +909,8 @@ class InferenceEngine:
 
     def get_shard_info(self, model_id: str) -> Optional[ModelShard]:
         """Get the shard loaded for a specific model."""
-        for shard in self.loaded_shards.values():
-            if shard.model_id == model_id:
-                return shard
-        return None
+        plan = self._stage_plans.get(model_id)
+        return plan[0] if plan else None
 
     def get_stats(self) -> Dict:
         """Get inference engine statistics."""
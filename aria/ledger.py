@@ -156,6 +156,23 @@ class ProvenanceLedger:
         
         return record_hash
     
+    def add_records(self, records: List[InferenceRecord]) -> List[str]:
+        """
+        Add several inference records to the pending pool at once.
+        Returns the record hashes, in order.
+        
+        Equivalent to calling add_record() for each record, but full
+        blocks are sealed once after the whole batch is appended.
+        """
+        record_hashes = [record.to_hash() for record in records]
+        self.pending_records.extend(records)
+        
+        # Seal every full block the batch completed
+        while len(self.pending_records) >= self.records_per_block:
+            self.seal_pending_block()
+        
+        return record_hashes
+    
     def seal_pending_block(self, contributor_id: str = "local") -> Optional[Block]:
         """Seal a new block with all pending records."""
         if not self.pending_records:
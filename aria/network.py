@@ -17,12 +17,17 @@ MIT License - Anthony MURGO, 2026
 
 import asyncio
 import json
+import bisect
 import hashlib
+import heapq
+import itertools
+import math
 import time
 import logging
 import re
 import ssl
 import os
+from collections import OrderedDict
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -68,6 +73,39 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("aria.network")
 
 
+# Optional fast JSON codec (pip install aria-protocol[fast]). Messages
+# stay str so they go out as text frames, as peers expect.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json's
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop as the asyncio event loop implementation if available.
+
+    uvloop is an optional dependency (pip install aria-protocol[fast]).
+    Must be called before the event loop is created, typically at the
+    application entry point. Library code never calls this implicitly.
+
+    Returns:
+        True if uvloop was installed, False if it is unavailable
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 # Default TLS certificate directory
 TLS_DIR = Path.home() / ".aria" / "tls"
 
@@ -199,31 +237,108 @@ def create_ssl_context(
 import ipaddress  # noqa: E402
 
 
-@dataclass
+@dataclass(slots=True)
 class PeerInfo:
-    """Information about a peer in the network."""
+    """
+    Information about a peer in the network.
+
+    Slotted: routing reads these fields for every peer on every
+    request, and slot access skips the per-instance __dict__.
+    """
     node_id: str
     host: str
     port: int
     consent: Optional[ARIAConsent] = None
     reputation: float = 1.0          # [0, 1] reliability score
     available_shards: List[str] = field(default_factory=list)
-    last_seen: float = field(default_factory=time.time)
+    # Local bookkeeping times use time.monotonic(): immune to wall-clock
+    # jumps and never sent over the wire
+    last_seen: float = field(default_factory=time.monotonic)
     total_inferences: int = 0
     avg_latency_ms: float = 0.0
     energy_efficiency: float = 1.0   # Lower is better
+    zone: str = ""                   # Deployment zone/rack ("" = unknown)
+    reputation_updated: float = field(default_factory=time.monotonic)
+    # (consent, compiled predicate), rebuilt when consent is replaced
+    _consent_matcher: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Reputation penalties fade back toward 1.0 with this time constant
+    REPUTATION_DECAY_TAU = 3600.0    # seconds
+    REPUTATION_SUCCESS_DELTA = 0.01
+    REPUTATION_FAILURE_DELTA = -0.1
+    # Weight of the newest sample in the latency moving average
+    LATENCY_EWMA_ALPHA = 0.2
+    # A peer not seen for this long is considered dead
+    ALIVE_TIMEOUT = 300              # seconds
 
     @property
     def is_alive(self) -> bool:
         """Consider a peer dead if not seen for 5 minutes."""
-        return (time.time() - self.last_seen) < 300
+        return (time.monotonic() - self.last_seen) < self.ALIVE_TIMEOUT
+
+    def current_reputation(self) -> float:
+        """
+        Reputation with past penalties decayed toward neutral.
+
+        Negative reputation is ephemeral: the gap to 1.0 shrinks by
+        exp(-elapsed / REPUTATION_DECAY_TAU). Computed lazily on read,
+        so no history needs to be stored or recomputed.
+        """
+        if self.reputation >= 1.0:
+            return self.reputation
+        elapsed = time.monotonic() - self.reputation_updated
+        if elapsed <= 0:
+            return self.reputation
+        decay = math.exp(-elapsed / self.REPUTATION_DECAY_TAU)
+        return 1.0 - (1.0 - self.reputation) * decay
+
+    def adjust_reputation(self, delta: float):
+        """Apply a reputation change on top of the decayed value."""
+        self.reputation = max(0.0, min(1.0, self.current_reputation() + delta))
+        self.reputation_updated = time.monotonic()
+
+    def record_latency(self, latency_ms: float):
+        """Fold a latency sample into the exponentially weighted average."""
+        if self.total_inferences == 0 and self.avg_latency_ms == 0.0:
+            self.avg_latency_ms = float(latency_ms)
+        else:
+            alpha = self.LATENCY_EWMA_ALPHA
+            self.avg_latency_ms = alpha * latency_ms + (1 - alpha) * self.avg_latency_ms
+
+    def record_success(self, latency_ms: float):
+        """Record a request this peer served successfully."""
+        self.record_latency(latency_ms)
+        self.total_inferences += 1
+        self.adjust_reputation(self.REPUTATION_SUCCESS_DELTA)
+
+    def record_failure(self):
+        """Record a request this peer failed or timed out on."""
+        self.adjust_reputation(self.REPUTATION_FAILURE_DELTA)
+
+    def matches_request(self, request: dict,
+                        now: Optional[time.struct_time] = None) -> bool:
+        """
+        Check a request against this peer's consent.
+
+        The consent is compiled once per consent object (see
+        ARIAConsent.compile) and reused for every routing decision.
+        Peers without consent never match.
+        """
+        if self.consent is None:
+            return False
+        cached = self._consent_matcher
+        if cached is None or cached[0] is not self.consent:
+            cached = self._consent_matcher = (self.consent, self.consent.compile())
+        return cached[1](request, now)
 
     def quality_score(self) -> float:
         """
         Compute a composite quality score for routing decisions.
         Higher is better.
         """
-        uptime_factor = min(self.reputation, 1.0)
+        uptime_factor = min(self.current_reputation(), 1.0)
         latency_factor = max(0, 1.0 - (self.avg_latency_ms / 5000))
         efficiency_factor = 1.0 / max(self.energy_efficiency, 0.1)
 
@@ -236,11 +351,12 @@ class PeerInfo:
             "host": self.host,
             "port": self.port,
             "consent": self.consent.to_dict() if self.consent else None,
-            "reputation": self.reputation,
+            "reputation": self.current_reputation(),
             "available_shards": self.available_shards,
             "total_inferences": self.total_inferences,
             "avg_latency_ms": self.avg_latency_ms,
             "energy_efficiency": self.energy_efficiency,
+            "zone": self.zone,
         }
 
     @classmethod
@@ -259,6 +375,7 @@ class PeerInfo:
             total_inferences=data.get("total_inferences", 0),
             avg_latency_ms=data.get("avg_latency_ms", 0.0),
             energy_efficiency=data.get("energy_efficiency", 1.0),
+            zone=data.get("zone", ""),
         )
 
 
@@ -322,18 +439,30 @@ class ARIANetwork:
     RECONNECT_DELAY = 5      # seconds
     PIPELINE_TIMEOUT = 5.0   # seconds - timeout before fallback to replica
     MAX_RETRIES = 2          # Maximum retries with replicas
+    MAX_PEERS = 4096         # Routing table cap (least recently seen evicted)
+    MAX_CONNECTIONS = 512    # Open WebSocket cap (least recently used closed)
+    ROUTE_CACHE_SIZE = 1024  # Cached (model_id, layer) -> stage lookups
+    ROUTE_CACHE_TTL = 5.0    # seconds - bounds staleness from liveness/quality drift
+    RING_VNODES = 64         # Hash ring points per peer (smooths load split)
+    PIPELINE_BATCH_SIZE = 8       # Max pipeline states per forward message
+    PIPELINE_BATCH_DELAY = 0.005  # seconds - max wait to fill a forward batch
+    ROUTING_PREFIX_CHARS = 64  # Query prefix that picks the target peer
 
     def __init__(self, node_id: str, host: str = "0.0.0.0", port: int = 8765,
                  consent: Optional[ARIAConsent] = None,
                  use_tls: bool = False,
                  cert_path: Optional[Path] = None,
                  key_path: Optional[Path] = None,
-                 verify_tls: bool = False):
+                 verify_tls: bool = False,
+                 zone: Optional[str] = None):
         self.node_id = node_id
         self.host = host
         self.port = port
         self.consent = consent
 
+        # Deployment zone; pipeline stages prefer peers in the same one
+        self.zone = zone if zone is not None else os.environ.get("ARIA_ZONE", "")
+
         # TLS configuration
         self.use_tls = use_tls
         self.cert_path = cert_path or TLS_DIR / "server.crt"
@@ -341,11 +470,11 @@ class ARIANetwork:
         self.verify_tls = verify_tls
         self._ssl_context: Optional[ssl.SSLContext] = None
 
-        # Routing table
-        self.peers: Dict[str, PeerInfo] = {}
+        # Routing table, ordered least to most recently seen
+        self.peers: OrderedDict[str, PeerInfo] = OrderedDict()
 
-        # Shard registry: model_shard_id -> list of node_ids
-        self.shard_registry: Dict[str, List[str]] = {}
+        # Shard registry: model_shard_id -> set of node_ids
+        self.shard_registry: Dict[str, Set[str]] = {}
 
         # Message handlers
         self._handlers: Dict[str, Callable] = {}
@@ -356,16 +485,35 @@ class ARIANetwork:
 
         # WebSocket connections
         self._server = None
-        self._connections: Dict[str, websockets.asyncio.client.ClientConnection] = {}
+        # Ordered least to most recently used
+        self._connections: OrderedDict[str, websockets.asyncio.client.ClientConnection] = OrderedDict()
         self._running = False
         self._tasks: Set[asyncio.Task] = set()
 
-        # Locks for connection access (prevent concurrent recv)
-        self._connection_locks: Dict[str, asyncio.Lock] = {}
+        # Requests awaiting a reply, per connection: msg_id -> future.
+        # Each connection has exactly one reader that resolves these.
+        self._pending: Dict[object, OrderedDict[object, asyncio.Future]] = {}
+        self._message_ids = itertools.count(1)
 
         # Available shards on this node
         self.local_shards: List[str] = []
 
+        # (model_id, layer) -> (expires_at, stage), least recently used first.
+        # Cleared whenever peers or shard holders change.
+        self._route_cache: OrderedDict[Tuple[str, int], tuple] = OrderedDict()
+
+        # Pipeline forwards: node_id -> states waiting to be sent together,
+        # and node_id -> forward messages currently awaiting a reply
+        self._forward_batches: Dict[str, list] = {}
+        self._forwards_in_flight: Dict[str, int] = {}
+
+        # (model_id, total_layers) -> (sorted ring positions, node_id at each position)
+        self._hash_rings: Dict[Tuple[str, int], Tuple[List[int], List[str]]] = {}
+
+        # Last announced shard set and the peers that already received it
+        self._announced_shards: Optional[Tuple[str, ...]] = None
+        self._shards_announced_to: Set[str] = set()
+
         # Inference request handler callback
         self._inference_callback: Optional[Callable] = None
 
@@ -389,6 +537,7 @@ class ARIANetwork:
         self._handlers["inference_request"] = self._handle_inference_request
         self._handlers["get_peers"] = self._handle_get_peers
         self._handlers["pipeline_forward"] = self._handle_pipeline_forward
+        self._handlers["pipeline_forward_batch"] = self._handle_pipeline_forward_batch
         # CLI command handlers
         self._handlers["get_stats"] = self._handle_get_stats
         self._handlers["get_ledger_stats"] = self._handle_get_ledger_stats
@@ -453,12 +602,14 @@ class ARIANetwork:
         )
 
         # Start heartbeat task
-        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
-        self._tasks.add(heartbeat_task)
-        heartbeat_task.add_done_callback(self._tasks.discard)
+        self._spawn(self._heartbeat_loop())
 
         protocol = "wss" if self.use_tls else "ws"
         logger.info(f"[{self.node_id}] Network started on {protocol}://{self.host}:{self.port}")
+        logger.debug(
+            f"[{self.node_id}] Event loop: "
+            f"{type(asyncio.get_running_loop()).__module__}"
+        )
 
     async def stop(self):
         """Stop the WebSocket server and all connections."""
@@ -475,7 +626,7 @@ class ARIANetwork:
             except Exception as e:
                 logger.debug(f"[{self.node_id}] Error closing connection to {node_id}: {e}")
         self._connections.clear()
-        self._connection_locks.clear()
+        self._shards_announced_to.clear()
 
         # Close server
         if self._server:
@@ -485,27 +636,92 @@ class ARIANetwork:
 
         logger.info(f"[{self.node_id}] Network stopped")
 
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine as a background task owned by this network."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
     async def _handle_connection(self, websocket):
         """Handle incoming WebSocket connections."""
+        await self._read_frames(websocket)
+
+    async def _read_frames(self, websocket, peer_id: Optional[str] = None):
+        """
+        The single reader of a connection, inbound or outbound.
+
+        Replies resolve the pending request they answer; requests are
+        dispatched as separate tasks so a slow handler (or one that calls
+        back into the same peer) never stalls the reader.
+
+        Args:
+            websocket: The connection to read from
+            peer_id: The peer at the other end, if already known
+        """
         try:
-            async for message in websocket:
-                response = await self.handle_message(message)
-                if response:
-                    await websocket.send(response)
+            async for frame in websocket:
+                # Decode once; the envelope serves routing and dispatch
+                msg = self._decode_message(frame)
+                if msg is not None and self._resolve_reply(websocket, msg):
+                    continue
 
-                    # Track the connection by peer_id if available
-                    try:
-                        msg = json.loads(message)
-                        sender_id = msg.get("sender_id")
-                        if sender_id and sender_id not in self._connections:
-                            self._connections[sender_id] = websocket
-                    except (json.JSONDecodeError, AttributeError):
-                        pass
+                # Track the connection by peer_id if available
+                sender_id = msg.get("sender_id") if msg else None
+                if sender_id and sender_id not in self._connections:
+                    self._register_connection(sender_id, websocket)
+                    peer_id = peer_id or sender_id
+
+                self._spawn(self._serve_request(websocket, msg))
 
         except websockets.exceptions.ConnectionClosed:
             logger.debug(f"[{self.node_id}] Connection closed")
         except Exception as e:
             logger.error(f"[{self.node_id}] Connection error: {e}")
+        finally:
+            # Fail whatever was still waiting on this connection
+            for future in self._pending.pop(websocket, {}).values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+            if peer_id and self._connections.get(peer_id) is websocket:
+                del self._connections[peer_id]
+
+    def _resolve_reply(self, websocket, msg: dict) -> bool:
+        """
+        Hand a decoded reply to the request waiting for it.
+
+        Replies carry the request's msg_id as reply_to. Peers that predate
+        reply_to send bare responses (no sender_id); those answer the
+        oldest pending request on the connection.
+
+        Returns:
+            True if the frame was a reply and has been consumed
+        """
+        pending = self._pending.get(websocket)
+
+        if "reply_to" in msg:
+            future = pending.pop(msg["reply_to"], None) if pending else None
+        elif "type" not in msg or ("sender_id" not in msg and pending):
+            future = pending.popitem(last=False)[1] if pending else None
+        else:
+            return False
+
+        if future is not None and not future.done():
+            future.set_result(msg)
+        elif future is None:
+            logger.debug(f"[{self.node_id}] Dropping unmatched reply")
+        return True
+
+    async def _serve_request(self, websocket, msg: Optional[dict]):
+        """Dispatch one request frame and send back its response."""
+        try:
+            response = await self._dispatch_message(msg)
+            if response:
+                await websocket.send(response)
+        except websockets.exceptions.ConnectionClosed:
+            logger.debug(f"[{self.node_id}] Connection closed before reply")
+        except Exception as e:
+            logger.error(f"[{self.node_id}] Request handling error: {e}")
 
     # ==========================================
     # WEBSOCKET CLIENT
@@ -542,25 +758,39 @@ class ARIANetwork:
                 "port": self.port,
                 "consent": self.consent.to_dict() if self.consent else None,
                 "shards": self.local_shards,
+                "zone": self.zone,
             })
             await ws.send(announce_msg)
 
             # Wait for response
             response = await asyncio.wait_for(ws.recv(), timeout=5.0)
-            resp_data = json.loads(response)
+            resp_data = _json_loads(response)
 
             if resp_data.get("status") == "accepted":
-                # Store connection with its lock
+                # Store connection and start its reader
                 peer_id = resp_data.get("peer_id", f"{host}:{port}")
-                self._connections[peer_id] = ws
-                self._connection_locks[peer_id] = asyncio.Lock()
-
-                # Add to peers
-                self.add_peer(PeerInfo(
-                    node_id=peer_id,
-                    host=host,
-                    port=port,
-                ))
+                self._register_connection(peer_id, ws)
+                self._spawn(self._read_frames(ws, peer_id))
+
+                zone = resp_data.get("zone", "")
+                peer = self.peers.get(peer_id)
+                if peer is not None:
+                    # Reconnecting to a known peer (e.g. after its connection
+                    # was evicted): keep its reputation, latency, consent and
+                    # shards, refreshing only where and when we reached it
+                    peer.host = host
+                    peer.port = port
+                    if peer.zone != zone:
+                        peer.zone = zone
+                        self._invalidate_routes()
+                    self._touch_peer(peer_id)
+                else:
+                    self.add_peer(PeerInfo(
+                        node_id=peer_id,
+                        host=host,
+                        port=port,
+                        zone=zone,
+                    ))
 
                 logger.info(f"[{self.node_id}] Connected to peer {peer_id}")
                 return True
@@ -577,6 +807,41 @@ class ARIANetwork:
 
     async def send_to_peer(self, peer_id: str, message: str) -> Optional[str]:
         """Send a message to a specific peer and wait for response."""
+        msg = self._decode_message(message)
+        msg_id = msg.get("msg_id") if msg else None
+
+        try:
+            reply = await self._request(peer_id, message, msg_id, timeout=10.0)
+        except Exception as e:
+            logger.error(f"[{self.node_id}] Send failed to {peer_id}: {e}")
+            return None
+        return _json_dumps(reply) if reply is not None else None
+
+    async def request(self, peer_id: str, msg_type: str, data: dict,
+                      timeout: float = 10.0) -> Optional[dict]:
+        """
+        Send a request to a peer and wait for its decoded reply.
+
+        Unlike send_to_peer(), the message is built here, so its msg_id
+        is known without re-parsing it, and the reply is returned as the
+        dict the connection reader already decoded, minus the internal
+        reply_to correlation field.
+
+        Returns:
+            The reply, or None if the peer is unreachable or timed out
+        """
+        msg_id, message = self._new_message(msg_type, data)
+        try:
+            reply = await self._request(peer_id, message, msg_id, timeout)
+        except Exception as e:
+            logger.error(f"[{self.node_id}] Request failed to {peer_id}: {e}")
+            return None
+        if reply is not None:
+            reply.pop("reply_to", None)
+        return reply
+
+    async def _get_connection(self, peer_id: str):
+        """Return the open connection to a peer, connecting if needed."""
         ws = self._connections.get(peer_id)
         if not ws:
             # Try to connect if we have peer info
@@ -585,32 +850,70 @@ class ARIANetwork:
                 if await self.connect_to_peer(peer.host, peer.port):
                     ws = self._connections.get(peer_id)
 
+        if ws:
+            self._connections.move_to_end(peer_id)
+        return ws
+
+    async def _request(self, peer_id: str, message: str, msg_id: Optional[int],
+                       timeout: Optional[float]) -> Optional[dict]:
+        """
+        Send a request and wait for the reply routed back by the reader.
+
+        Concurrent requests to the same peer need no lock: each waits on
+        its own future, keyed by msg_id.
+
+        Returns:
+            The decoded reply, or None if the peer is unreachable
+
+        Raises:
+            asyncio.TimeoutError: No reply within timeout
+            ConnectionError: The connection closed while waiting
+        """
+        ws = await self._get_connection(peer_id)
         if not ws:
             return None
 
-        # Get or create lock for this connection
-        if peer_id not in self._connection_locks:
-            self._connection_locks[peer_id] = asyncio.Lock()
-
-        lock = self._connection_locks[peer_id]
+        future = asyncio.get_running_loop().create_future()
+        key = msg_id if msg_id is not None else object()
+        pending = self._pending.setdefault(ws, OrderedDict())
+        pending[key] = future
 
         try:
-            async with lock:
-                await ws.send(message)
-                response = await asyncio.wait_for(ws.recv(), timeout=10.0)
-                return response
-        except Exception as e:
-            logger.error(f"[{self.node_id}] Send failed to {peer_id}: {e}")
-            return None
+            await ws.send(message)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            pending.pop(key, None)
+            if not pending and self._pending.get(ws) is pending:
+                del self._pending[ws]
+
+    async def broadcast(self, message: str, peer_ids: Optional[Set[str]] = None) -> Set[str]:
+        """
+        Broadcast a message to connected peers (fire-and-forget).
+
+        Args:
+            message: Serialized protocol message
+            peer_ids: Restrict the broadcast to these peers (default: all)
+
+        Returns:
+            IDs of the peers the message was sent to successfully
+        """
+        # Encode once and send the same buffer to every peer as a text
+        # frame, instead of letting each send() re-encode the string
+        payload = message.encode()
+        delivered: Set[str] = set()
 
-    async def broadcast(self, message: str):
-        """Broadcast a message to all connected peers (fire-and-forget)."""
         for peer_id, ws in list(self._connections.items()):
+            if peer_ids is not None and peer_id not in peer_ids:
+                continue
             try:
                 # Fire and forget - don't wait for response
-                await ws.send(message)
+                await ws.send(payload, text=True)
             except Exception as e:
                 logger.debug(f"[{self.node_id}] Broadcast send to {peer_id} failed: {e}")
+            else:
+                delivered.add(peer_id)
+
+        return delivered
 
     # ==========================================
     # BOOTSTRAP & DISCOVERY
@@ -625,18 +928,24 @@ class ARIANetwork:
         """
         logger.info(f"[{self.node_id}] Bootstrapping with {len(seed_peers)} seed peers")
 
+        addresses = []
         for peer_addr in seed_peers:
             try:
                 host, port = peer_addr.split(":")
                 port = int(port)
-
-                # Skip self
-                if port == self.port:
-                    continue
-
-                await self.connect_to_peer(host, port)
             except ValueError:
                 logger.warning(f"[{self.node_id}] Invalid peer address: {peer_addr}")
+                continue
+
+            # Skip self
+            if port == self.port:
+                continue
+
+            addresses.append((host, port))
+
+        # Connect to all seeds concurrently: a slow or dead seed costs
+        # one handshake timeout in total, not one per seed
+        await asyncio.gather(*(self.connect_to_peer(host, port) for host, port in addresses))
 
         # Request peer lists from connected peers
         await self._discover_more_peers()
@@ -661,23 +970,16 @@ class ARIANetwork:
                     break
 
                 # Send ping to all connected peers
-                ping_msg = self.create_message("ping", {"timestamp": time.time()})
+                ping_id, ping_msg = self._new_message("ping", {"timestamp": time.time()})
 
                 for peer_id in list(self._connections.keys()):
                     try:
                         # Use a short timeout for heartbeats
-                        response = await asyncio.wait_for(
-                            self.send_to_peer(peer_id, ping_msg),
-                            timeout=5.0
+                        response = await self._request(
+                            peer_id, ping_msg, ping_id, timeout=5.0
                         )
-                        if response:
-                            try:
-                                data = json.loads(response)
-                                if data.get("type") == "pong":
-                                    if peer_id in self.peers:
-                                        self.peers[peer_id].last_seen = time.time()
-                            except json.JSONDecodeError:
-                                pass
+                        if response and response.get("type") == "pong":
+                            self._touch_peer(peer_id)
                     except asyncio.TimeoutError:
                         logger.debug(f"[{self.node_id}] Heartbeat timeout for {peer_id}")
                     except Exception as e:
@@ -696,16 +998,27 @@ class ARIANetwork:
     # ==========================================
 
     def add_peer(self, peer: PeerInfo):
-        """Add or update a peer in the routing table."""
-        peer.last_seen = time.time()
+        """
+        Add or update a peer in the routing table.
+
+        The table is capped at MAX_PEERS; adding a new peer to a full
+        table evicts the least recently seen one (never ourselves).
+        """
+        peer.last_seen = time.monotonic()
+        old = self.peers.get(peer.node_id)
+        if old is not None:
+            self.peers.move_to_end(peer.node_id)
+            # Shards only the replaced entry held are no longer routable to it
+            for shard_id in set(old.available_shards).difference(peer.available_shards):
+                self._unregister_shard(shard_id, peer.node_id)
+        elif len(self.peers) >= self.MAX_PEERS:
+            self._evict_stale_peer()
         self.peers[peer.node_id] = peer
 
         # Update shard registry
         for shard_id in peer.available_shards:
-            if shard_id not in self.shard_registry:
-                self.shard_registry[shard_id] = []
-            if peer.node_id not in self.shard_registry[shard_id]:
-                self.shard_registry[shard_id].append(peer.node_id)
+            self.shard_registry.setdefault(shard_id, set()).add(peer.node_id)
+        self._invalidate_routes()
 
     def remove_peer(self, node_id: str):
         """Remove a peer from the routing table."""
@@ -713,25 +1026,63 @@ class ARIANetwork:
             peer = self.peers.pop(node_id)
             # Clean shard registry
             for shard_id in peer.available_shards:
-                if shard_id in self.shard_registry:
-                    self.shard_registry[shard_id] = [
-                        nid for nid in self.shard_registry[shard_id]
-                        if nid != node_id
-                    ]
-
-        # Clean up connection and lock
-        self._connection_locks.pop(node_id, None)
+                self._unregister_shard(shard_id, node_id)
+            self._invalidate_routes()
+
+        # Clean up connection
+        self._shards_announced_to.discard(node_id)
         if node_id in self._connections:
             ws = self._connections.pop(node_id)
             asyncio.create_task(ws.close())
 
+    def _unregister_shard(self, shard_id: str, node_id: str):
+        """Remove a node from a shard's holders, dropping empty entries."""
+        holders = self.shard_registry.get(shard_id)
+        if holders is not None:
+            holders.discard(node_id)
+            if not holders:
+                del self.shard_registry[shard_id]
+
+    def _touch_peer(self, node_id: str):
+        """Mark a known peer as just seen."""
+        peer = self.peers.get(node_id)
+        if peer is not None:
+            peer.last_seen = time.monotonic()
+            self.peers.move_to_end(node_id)
+
+    def _evict_stale_peer(self):
+        """Drop the least recently seen peer to make room in the table."""
+        for node_id in self.peers:
+            if node_id != self.node_id:
+                logger.debug(f"[{self.node_id}] Routing table full, evicting {node_id}")
+                self.remove_peer(node_id)
+                return
+
+    def _register_connection(self, peer_id: str, ws):
+        """
+        Track an open connection, closing the least recently used one
+        when MAX_CONNECTIONS is reached.
+        """
+        if peer_id not in self._connections and len(self._connections) >= self.MAX_CONNECTIONS:
+            lru_id, lru_ws = self._connections.popitem(last=False)
+            logger.debug(f"[{self.node_id}] Connection limit reached, closing {lru_id}")
+            self._spawn(lru_ws.close())
+        if self._connections.get(peer_id) is not ws:
+            # A fresh connection has not seen our shard announcement
+            self._shards_announced_to.discard(peer_id)
+        self._connections[peer_id] = ws
+        self._connections.move_to_end(peer_id)
+
     def get_alive_peers(self) -> List[PeerInfo]:
         """Get all peers that are currently alive."""
-        return [p for p in self.peers.values() if p.is_alive]
+        # One clock read for the whole scan rather than one per peer
+        cutoff = time.monotonic() - PeerInfo.ALIVE_TIMEOUT
+        return [p for p in self.peers.values() if p.last_seen > cutoff]
 
     def prune_dead_peers(self):
         """Remove peers that haven't been seen recently."""
-        dead = [nid for nid, p in self.peers.items() if not p.is_alive]
+        cutoff = time.monotonic() - PeerInfo.ALIVE_TIMEOUT
+        dead = [nid for nid, p in self.peers.items() if p.last_seen <= cutoff]
         for nid in dead:
             self.remove_peer(nid)
 
@@ -739,7 +1090,8 @@ class ARIANetwork:
     # CONSENT-BASED ROUTING
     # ==========================================
 
-    def find_peers_for_request(self, request: InferenceRequest) -> List[PeerInfo]:
+    def find_peers_for_request(self, request: InferenceRequest,
+                               limit: Optional[int] = None) -> List[PeerInfo]:
         """
         Find peers that match an inference request based on:
         1. Consent parameters (schedule, task type, resources)
@@ -748,21 +1100,30 @@ class ARIANetwork:
 
         Returns peers sorted by quality score (best first).
         This is the core routing algorithm of ARIA.
+
+        Args:
+            request: The inference request to route
+            limit: If set, only the best ``limit`` peers are returned.
+                Selection is a partial heap pass rather than a full sort,
+                which matters for large routing tables.
         """
-        matching_peers = []
+        # The consent view of the request is the same for every peer
+        req_dict = {
+            "task_type": request.task_type,
+            "ram_mb": request.ram_mb,
+            "contribution_score": request.contribution_score,
+        }
 
-        for peer in self.get_alive_peers():
-            # Check consent
-            if peer.consent is None:
-                continue
+        # Sample the clock once for every consent schedule check
+        now = time.gmtime()
 
-            req_dict = {
-                "task_type": request.task_type,
-                "ram_mb": request.ram_mb,
-                "contribution_score": request.contribution_score,
-            }
+        # (score, insertion order, peer): each score is computed exactly
+        # once and ties keep routing-table order
+        scored = []
 
-            if not peer.consent.matches_request(req_dict):
+        for peer in self.get_alive_peers():
+            # Check consent
+            if not peer.matches_request(req_dict, now):
                 continue
 
             # Check if peer has relevant shards
@@ -775,21 +1136,122 @@ class ARIANetwork:
             if not has_shard:
                 continue
 
-            matching_peers.append(peer)
+            scored.append((-peer.quality_score(), len(scored), peer))
 
-        # Sort by quality score (best first)
-        matching_peers.sort(key=lambda p: p.quality_score(), reverse=True)
+        # Best first
+        if limit is not None and limit < len(scored):
+            best = heapq.nsmallest(limit, scored)
+        else:
+            best = sorted(scored)
 
-        return matching_peers
+        return [peer for _, _, peer in best]
 
     def find_shard_holders(self, shard_id: str) -> List[PeerInfo]:
         """Find all peers holding a specific model shard."""
-        node_ids = self.shard_registry.get(shard_id, [])
+        node_ids = self.shard_registry.get(shard_id, ())
         return [
             self.peers[nid] for nid in node_ids
             if nid in self.peers and self.peers[nid].is_alive
         ]
 
+    @staticmethod
+    def _ring_position(key: str) -> int:
+        """64-bit position of a key on the hash ring."""
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    @staticmethod
+    def _covers_layers(ranges: List[Tuple[int, int]], total_layers: int) -> bool:
+        """True if the inclusive layer ranges together cover 0..total_layers-1."""
+        next_layer = 0
+        for start, end in sorted(ranges):
+            if start > next_layer:
+                return False
+            next_layer = max(next_layer, end + 1)
+        return next_layer >= total_layers
+
+    def _hash_ring(self, model_id: str, total_layers: int
+                   ) -> Tuple[List[int], List[str]]:
+        """
+        Build (or reuse) the hash ring of peers holding a whole model.
+
+        Only peers whose shards of exactly model_id cover every layer are
+        placed on the ring; a peer with a partial copy cannot serve a
+        full inference on its own.
+        """
+        key = (model_id, total_layers)
+        ring = self._hash_rings.get(key)
+        if ring is None:
+            layer_ranges: Dict[str, List[Tuple[int, int]]] = {}
+            for shard_id, node_ids in self.shard_registry.items():
+                start, end = self._parse_shard_layers(shard_id)
+                # Exact match: "aria-2b" must not pick up "aria-2b-v2" shards
+                if start < 0 or shard_id != f"{model_id}_L{start}-{end}":
+                    continue
+                for nid in node_ids:
+                    layer_ranges.setdefault(nid, []).append((start, end))
+            layer_ranges.pop(self.node_id, None)
+
+            points = sorted(
+                (self._ring_position(f"{nid}#{v}"), nid)
+                for nid, ranges in layer_ranges.items()
+                if self._covers_layers(ranges, total_layers)
+                for v in range(self.RING_VNODES)
+            )
+            ring = ([pos for pos, _ in points], [nid for _, nid in points])
+            self._hash_rings[key] = ring
+        return ring
+
+    def route_inference_request(self, query: str, model_id: str,
+                                total_layers: int = 24,
+                                task_type: TaskType = TaskType.TEXT_GENERATION,
+                                ram_mb: int = 512,
+                                contribution_score: float = 0.01) -> Optional[str]:
+        """
+        Pick the peer that should serve a query, by consistent hashing.
+
+        Queries sharing a (model_id, prefix) always land on the same
+        peer while it is alive, keeping its caches warm. When peers join
+        or leave, only the keys next to them on the ring move.
+
+        Args:
+            query: The input text/prompt
+            model_id: Model the request needs
+            total_layers: Total layers in the model; a peer must hold
+                all of them
+            task_type: Task type checked against each peer's consent
+            ram_mb: RAM the request needs, checked against consent
+            contribution_score: Contribution score offered, checked
+                against consent
+
+        Returns:
+            node_id of an alive, consenting peer holding the whole
+            model, or None
+        """
+        positions, node_ids = self._hash_ring(model_id, total_layers)
+        if not positions:
+            return None
+
+        key = f"{model_id}:{query[:self.ROUTING_PREFIX_CHARS]}"
+        start = bisect.bisect(positions, self._ring_position(key))
+
+        # Consent schedules depend on the time of day, so they are checked
+        # here rather than baked into the cached ring
+        req_dict = {
+            "task_type": task_type,
+            "ram_mb": ram_mb,
+            "contribution_score": contribution_score,
+        }
+        now = time.gmtime()
+
+        # Walk clockwise past peers that have gone quiet or stopped
+        # consenting since the build
+        for i in range(len(positions)):
+            node_id = node_ids[(start + i) % len(positions)]
+            peer = self.peers.get(node_id)
+            if peer is not None and peer.is_alive and peer.matches_request(req_dict, now):
+                return node_id
+        return None
+
     # ==========================================
     # MESSAGE HANDLING
     # ==========================================
@@ -805,8 +1267,7 @@ class ARIANetwork:
 
     async def _handle_pong(self, sender_id: str, data: dict) -> dict:
         """Handle pong response - update peer last_seen."""
-        if sender_id in self.peers:
-            self.peers[sender_id].last_seen = time.time()
+        self._touch_peer(sender_id)
         return {}  # No response needed
 
     async def _handle_peer_announce(self, sender_id: str, data: dict) -> dict:
@@ -820,6 +1281,7 @@ class ARIANetwork:
             port=data.get("port", 8765),
             consent=consent,
             available_shards=data.get("shards", []),
+            zone=data.get("zone", ""),
         )
         self.add_peer(peer)
 
@@ -829,6 +1291,7 @@ class ARIANetwork:
             "status": "accepted",
             "peer_count": len(self.peers),
             "peer_id": self.node_id,
+            "zone": self.zone,
         }
 
     async def _handle_shard_announce(self, sender_id: str, data: dict) -> dict:
@@ -836,12 +1299,14 @@ class ARIANetwork:
         shard_ids = data.get("shard_ids", [])
 
         if sender_id in self.peers:
-            self.peers[sender_id].available_shards = shard_ids
+            peer = self.peers[sender_id]
+            # Shards the peer no longer announces are no longer routable to it
+            for sid in set(peer.available_shards).difference(shard_ids):
+                self._unregister_shard(sid, sender_id)
+            peer.available_shards = shard_ids
             for sid in shard_ids:
-                if sid not in self.shard_registry:
-                    self.shard_registry[sid] = []
-                if sender_id not in self.shard_registry[sid]:
-                    self.shard_registry[sid].append(sender_id)
+                self.shard_registry.setdefault(sid, set()).add(sender_id)
+            self._invalidate_routes()
 
         # Return empty to avoid cluttering the response queue (broadcast message)
         return {}
@@ -879,6 +1344,19 @@ class ARIANetwork:
 
         return {"status": "error", "error": "No pipeline handler registered"}
 
+    async def _handle_pipeline_forward_batch(self, sender_id: str, data: dict) -> dict:
+        """
+        Handle several pipeline states sent in one message.
+
+        Each state is handled as if it arrived in its own pipeline_forward;
+        results are returned in the order the states were sent.
+        """
+        items = data.get("items", [])
+        results = await asyncio.gather(
+            *(self._handle_pipeline_forward(sender_id, item) for item in items)
+        )
+        return {"status": "completed", "results": results}
+
     async def _handle_get_stats(self, sender_id: str, data: dict) -> dict:
         """Handle stats request from CLI."""
         if self._stats_callback:
@@ -957,14 +1435,24 @@ class ARIANetwork:
             if layer_start < 0:
                 continue
 
-            # Filter to only alive nodes
-            alive_nodes = [
-                nid for nid in node_ids
-                if nid in self.peers and self.peers[nid].is_alive
-            ]
+            # Filter to only alive nodes: same zone first, then best
+            # quality (node_id breaks ties so the primary is deterministic)
+            alive_nodes = sorted(
+                (nid for nid in node_ids
+                 if nid != self.node_id
+                 and nid in self.peers and self.peers[nid].is_alive),
+                key=lambda nid: (
+                    self._is_remote_zone(self.peers[nid]),
+                    -self.peers[nid].quality_score(),
+                    nid,
+                ),
+            )
 
-            # Include ourselves if we have this shard
-            if shard_id in self.local_shards and self.node_id not in alive_nodes:
+            # Include ourselves first if we have this shard
+            me = self.peers.get(self.node_id)
+            if shard_id in self.local_shards or (
+                self.node_id in node_ids and me is not None and me.is_alive
+            ):
                 alive_nodes.insert(0, self.node_id)
 
             if alive_nodes:
@@ -977,20 +1465,16 @@ class ARIANetwork:
         chain = []
         for shard_id, layer_start, layer_end, node_ids in shard_info:
             primary = node_ids[0]  # First node is primary
-            replicas = node_ids[1:] if len(node_ids) > 1 else []
-
-            # Sort replicas by quality score
-            if replicas:
-                replicas.sort(
-                    key=lambda nid: self.peers[nid].quality_score()
-                    if nid in self.peers else 0,
-                    reverse=True
-                )
+            replicas = node_ids[1:]  # Already ordered by quality score
 
             chain.append((primary, shard_id, layer_start, layer_end, replicas))
 
         return chain
 
+    def _is_remote_zone(self, peer: PeerInfo) -> bool:
+        """True if we have a zone and the peer is not known to share it."""
+        return bool(self.zone) and peer.zone != self.zone
+
     def get_next_stage(self, model_id: str, current_layer: int
                        ) -> Optional[Tuple[str, str, int, int, List[str]]]:
         """
@@ -1004,14 +1488,31 @@ class ARIANetwork:
             Tuple of (node_id, shard_id, layer_start, layer_end, replicas)
             or None if no stage found
         """
+        key = (model_id, current_layer)
+        now = time.monotonic()
+        cached = self._route_cache.get(key)
+        if cached is not None and cached[0] > now:
+            self._route_cache.move_to_end(key)
+            return cached[1]
+
         chain = self.build_pipeline_chain(model_id)
 
         for node_id, shard_id, layer_start, layer_end, replicas in chain:
             if layer_start <= current_layer <= layer_end:
-                return (node_id, shard_id, layer_start, layer_end, replicas)
+                stage = (node_id, shard_id, layer_start, layer_end, replicas)
+                self._route_cache[key] = (now + self.ROUTE_CACHE_TTL, stage)
+                self._route_cache.move_to_end(key)
+                if len(self._route_cache) > self.ROUTE_CACHE_SIZE:
+                    self._route_cache.popitem(last=False)
+                return stage
 
         return None
 
+    def _invalidate_routes(self):
+        """Drop cached pipeline stages and hash rings after a topology change."""
+        self._route_cache.clear()
+        self._hash_rings.clear()
+
     async def forward_pipeline_state(self, target_node_id: str,
                                      state_dict: dict,
                                      replicas: List[str] = None
@@ -1042,41 +1543,32 @@ class ARIANetwork:
                 )
 
             try:
-                msg = self.create_message("pipeline_forward", {
-                    "state": state_dict,
-                    "is_replica": is_replica,
-                })
-
-                # Use our custom timeout instead of the default 10s
-                response = await asyncio.wait_for(
-                    self._send_with_retry(node_id, msg),
-                    timeout=self.PIPELINE_TIMEOUT
-                )
+                sent_at = time.perf_counter()
+                response = await self._forward_batched(node_id, state_dict, is_replica)
 
                 if response:
-                    try:
-                        result = json.loads(response)
-                        if result.get("status") != "error":
-                            return result
-                        logger.warning(
-                            f"[{self.node_id}] Node {node_id} returned error: "
-                            f"{result.get('error')}"
-                        )
-                    except json.JSONDecodeError:
-                        logger.warning(
-                            f"[{self.node_id}] Invalid JSON from {node_id}"
-                        )
+                    if response.get("status") != "error":
+                        latency_ms = (time.perf_counter() - sent_at) * 1000
+                        self._record_peer_outcome(node_id, latency_ms)
+                        return response
+                    logger.warning(
+                        f"[{self.node_id}] Node {node_id} returned error: "
+                        f"{response.get('error')}"
+                    )
+                self._record_peer_outcome(node_id)
 
             except asyncio.TimeoutError:
                 logger.warning(
                     f"[{self.node_id}] Timeout waiting for {node_id} "
                     f"(limit: {self.PIPELINE_TIMEOUT}s)"
                 )
+                self._record_peer_outcome(node_id)
                 continue
             except Exception as e:
                 logger.warning(
                     f"[{self.node_id}] Error forwarding to {node_id}: {e}"
                 )
+                self._record_peer_outcome(node_id)
                 continue
 
         # All nodes failed
@@ -1086,30 +1578,117 @@ class ARIANetwork:
         )
         return None
 
-    async def _send_with_retry(self, peer_id: str, message: str) -> Optional[str]:
-        """Send message with connection retry if needed."""
-        ws = self._connections.get(peer_id)
+    async def _forward_batched(self, node_id: str, state_dict: dict,
+                               is_replica: bool) -> Optional[dict]:
+        """
+        Forward one pipeline state, coalescing with others bound for the same node.
 
-        if not ws:
-            # Try to connect if we have peer info
-            if peer_id in self.peers:
-                peer = self.peers[peer_id]
-                if await self.connect_to_peer(peer.host, peer.port):
-                    ws = self._connections.get(peer_id)
+        With no forward to the node in flight the state is sent at once,
+        so an idle pipeline pays no batching delay. Otherwise it waits up
+        to PIPELINE_BATCH_DELAY for up to PIPELINE_BATCH_SIZE states and
+        they travel in one pipeline_forward_batch message.
 
-        if not ws:
-            return None
+        Raises:
+            asyncio.TimeoutError: No reply within PIPELINE_TIMEOUT
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item = (state_dict, is_replica, future)
+
+        batch = self._forward_batches.get(node_id)
+        if batch is None and not self._forwards_in_flight.get(node_id):
+            self._start_forward_batch(node_id, [item])
+        else:
+            if batch is None:
+                batch = self._forward_batches[node_id] = []
+                loop.call_later(self.PIPELINE_BATCH_DELAY,
+                                self._flush_forward_batch, node_id, batch)
+            batch.append(item)
+            if len(batch) >= self.PIPELINE_BATCH_SIZE:
+                self._flush_forward_batch(node_id, batch)
+
+        return await future
+
+    def _flush_forward_batch(self, node_id: str, batch: list):
+        """Send a pending forward batch (no-op if it already went out full)."""
+        if self._forward_batches.get(node_id) is batch:
+            del self._forward_batches[node_id]
+            self._start_forward_batch(node_id, batch)
+
+    def _start_forward_batch(self, node_id: str, batch: list):
+        """Count the forward as in flight right away, then send it."""
+        self._forwards_in_flight[node_id] = self._forwards_in_flight.get(node_id, 0) + 1
+        task = self._spawn(self._send_forward_batch(node_id, batch))
+        task.add_done_callback(lambda _: self._finish_forward_batch(node_id, batch))
+
+    def _finish_forward_batch(self, node_id: str, batch: list):
+        """Release the in-flight slot; cancel callers if the send never finished."""
+        self._forwards_in_flight[node_id] -= 1
+        if not self._forwards_in_flight[node_id]:
+            del self._forwards_in_flight[node_id]
+        for _, _, future in batch:
+            future.cancel()  # no-op for futures that already have a result
+
+    async def _forward_one(self, node_id: str, state_dict: dict,
+                           is_replica: bool) -> Optional[dict]:
+        """Send a single pipeline_forward and wait for its reply."""
+        msg_id, msg = self._new_message("pipeline_forward", {
+            "state": state_dict,
+            "is_replica": is_replica,
+        })
+        # Use our custom timeout instead of the default 10s
+        return await self._request(node_id, msg, msg_id, timeout=self.PIPELINE_TIMEOUT)
 
-        # Get or create lock for this connection
-        if peer_id not in self._connection_locks:
-            self._connection_locks[peer_id] = asyncio.Lock()
+    async def _send_forward_batch(self, node_id: str, batch: list):
+        """Send queued states to a node and resolve each caller's future."""
+        try:
+            if len(batch) == 1:
+                state_dict, is_replica, _ = batch[0]
+                results = [await self._forward_one(node_id, state_dict, is_replica)]
+            else:
+                msg_id, msg = self._new_message("pipeline_forward_batch", {
+                    "items": [{"state": state_dict, "is_replica": is_replica}
+                              for state_dict, is_replica, _ in batch],
+                })
+                reply = await self._request(node_id, msg, msg_id, timeout=self.PIPELINE_TIMEOUT)
+                results = reply.get("results") if reply else None
+                if reply is None:
+                    results = [None] * len(batch)
+                elif not isinstance(results, list) or len(results) != len(batch):
+                    # Peer predates batching: send the states one by one
+                    results = await asyncio.gather(
+                        *(self._forward_one(node_id, state_dict, is_replica)
+                          for state_dict, is_replica, _ in batch),
+                        return_exceptions=True,
+                    )
+        except Exception as e:
+            results = [e] * len(batch)
 
-        lock = self._connection_locks[peer_id]
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
 
-        async with lock:
-            await ws.send(message)
-            response = await ws.recv()
-            return response
+    def _record_peer_outcome(self, node_id: str,
+                             latency_ms: Optional[float] = None):
+        """
+        Update a peer's routing metrics after a forward attempt.
+
+        A latency means the peer answered successfully; None records a
+        failure (error, timeout or no response).
+        """
+        peer = self.peers.get(node_id)
+        if peer is None:
+            return
+        if latency_ms is None:
+            peer.record_failure()
+            # The failed peer may no longer be the best primary
+            self._invalidate_routes()
+        else:
+            peer.record_success(latency_ms)
 
     def get_pipeline_info(self, model_id: str) -> dict:
         """
@@ -1154,46 +1733,83 @@ class ARIANetwork:
         Process an incoming message and return a response.
         Messages are JSON with {type, sender_id, data}.
         """
-        self.messages_received += 1
+        return await self._dispatch_message(self._decode_message(raw_message))
 
+    @staticmethod
+    def _decode_message(raw_message: str) -> Optional[dict]:
+        """Decode a message envelope, or None if it is not a JSON object."""
         try:
-            msg = json.loads(raw_message)
-            msg_type = msg.get("type", "unknown")
-            sender_id = msg.get("sender_id", "unknown")
-            data = msg.get("data", {})
-
-            # Update last_seen for sender
-            if sender_id in self.peers:
-                self.peers[sender_id].last_seen = time.time()
-
-            handler = self._handlers.get(msg_type)
-            if handler:
-                response = await handler(sender_id, data)
-                if response:
-                    return json.dumps(response)
+            msg = _json_loads(raw_message)
+        except json.JSONDecodeError:
+            return None
+        return msg if isinstance(msg, dict) else None
+
+    async def _dispatch_message(self, msg: Optional[dict]) -> str:
+        """Route a decoded envelope to its handler and serialize the response."""
+        self.messages_received += 1
+
+        if msg is None:
+            return _json_dumps({"error": "Invalid JSON"})
+
+        msg_type = msg.get("type", "unknown")
+        sender_id = msg.get("sender_id", "unknown")
+
+        # Update last_seen for sender
+        self._touch_peer(sender_id)
+
+        handler = self._handlers.get(msg_type)
+        if handler:
+            response = await handler(sender_id, msg.get("data", {}))
+            if not response:
                 return ""
-            else:
-                return json.dumps({"error": f"Unknown message type: {msg_type}"})
+        else:
+            response = {"error": f"Unknown message type: {msg_type}"}
 
-        except json.JSONDecodeError:
-            return json.dumps({"error": "Invalid JSON"})
+        # Echo the request id so the sender's reader can route the reply
+        if "msg_id" in msg:
+            response = dict(response, reply_to=msg["msg_id"])
+        return _json_dumps(response)
 
     def create_message(self, msg_type: str, data: dict) -> str:
         """Create a properly formatted ARIA protocol message."""
+        return self._new_message(msg_type, data)[1]
+
+    def _new_message(self, msg_type: str, data: dict) -> Tuple[int, str]:
+        """Create a protocol message and return it with its msg_id."""
         self.messages_sent += 1
-        return json.dumps({
+        msg_id = next(self._message_ids)
+        return msg_id, _json_dumps({
             "type": msg_type,
             "sender_id": self.node_id,
+            "msg_id": msg_id,
             "data": data,
             "timestamp": time.time(),
             "protocol": "aria/0.1",
         })
 
     async def announce_shards(self, shard_ids: List[str]):
-        """Announce available shards to all connected peers."""
+        """
+        Announce available shards to connected peers.
+
+        An unchanged shard set is only sent to peers that have not
+        received it yet, so repeated announcements cost nothing.
+        """
         self.local_shards = shard_ids
+        self._invalidate_routes()
+
+        fingerprint = tuple(sorted(shard_ids))
+        if fingerprint != self._announced_shards:
+            self._announced_shards = fingerprint
+            self._shards_announced_to.clear()
+
+        targets = set(self._connections) - self._shards_announced_to
+        if not targets:
+            return
+
         msg = self.create_message("shard_announce", {"shard_ids": shard_ids})
-        await self.broadcast(msg)
+        # Only peers that actually received it count as announced; failed
+        # sends are retried on the next call
+        self._shards_announced_to.update(await self.broadcast(msg, targets))
 
     # ==========================================
     # NETWORK STATS
@@ -1212,7 +1828,7 @@ class ARIANetwork:
             "messages_sent": self.messages_sent,
             "messages_received": self.messages_received,
             "avg_peer_reputation": (
-                sum(p.reputation for p in alive_peers) / len(alive_peers)
+                sum(p.current_reputation() for p in alive_peers) / len(alive_peers)
                 if alive_peers else 0
             ),
             "tls_enabled": self.use_tls,
@@ -6,19 +6,58 @@ Join the network. Contribute compute. Build reputation.
 MIT License - Anthony MURGO, 2026
 """
 
-import json
+import asyncio
+import itertools
+import secrets
 import time
 import uuid
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 from aria.consent import ARIAConsent
 from aria.network import ARIANetwork, PeerInfo
-from aria.inference import InferenceEngine, InferenceResult, PipelineState
+from aria.inference import InferenceEngine, InferenceBatcher, InferenceResult, PipelineState
 from aria.ledger import ProvenanceLedger
 from aria.proof import ProofOfUsefulWork, ProofOfSobriety
 
 
+# Contribution score parameters (see ARIANode._calculate_contribution_score)
+CONTRIBUTION_BASE_RATE = 0.001      # Base contribution points per inference
+QUALITY_TARGET_MS = 1000            # <= this latency scores full quality
+QUALITY_RANGE_MS = 4000             # Quality reaches 0 at target + range
+MIN_QUALITY = 0.1
+ENERGY_BASELINE_MJ = 150            # GPU-equivalent energy per inference
+
+
+def contribution_score(latency_ms: float, energy_mj: float) -> float:
+    """
+    Contribution points for one inference from its latency and energy.
+
+    Kept free of node state so the per-request hot path is a single
+    call with module constants and no attribute lookups.
+    """
+    # Quality score: latency-based [0, 1]
+    # Target: <1000ms = perfect, >5000ms = minimum
+    quality = 1 - (latency_ms - QUALITY_TARGET_MS) / QUALITY_RANGE_MS
+    if quality > 1:
+        quality = 1
+    elif quality < MIN_QUALITY:
+        quality = MIN_QUALITY
+
+    # Efficiency bonus: energy-based [0.5, 2.0]
+    # Baseline: 150 mJ (GPU equivalent)
+    if energy_mj > 0:
+        efficiency = ENERGY_BASELINE_MJ / energy_mj
+        if efficiency > 2.0:
+            efficiency = 2.0
+        elif efficiency < 0.5:
+            efficiency = 0.5
+    else:
+        efficiency = 1.0
+
+    return CONTRIBUTION_BASE_RATE * quality * efficiency
+
+
 class ARIANode:
     """
     A node in the ARIA network.
@@ -54,6 +93,13 @@ class ARIANode:
         await node.stop()
     """
 
+    # Finished inferences awaiting ledger/proof recording; when full,
+    # process_request records inline (backpressure)
+    PROOF_QUEUE_SIZE = 8
+    # get_stats() is polled by CLI/dashboard/peers; it re-verifies the
+    # whole ledger, so answers are reused for this long (seconds)
+    STATS_CACHE_TTL = 0.25
+
     def __init__(self,
                  consent: Optional[ARIAConsent] = None,
                  cpu_percent: int = 25,
@@ -63,7 +109,10 @@ class ARIANode:
                  cert_path: Optional[Path] = None,
                  key_path: Optional[Path] = None,
                  verify_tls: bool = False,
-                 backend: str = "simulation"):
+                 backend: str = "simulation",
+                 batch_size: int = 16,
+                 batch_delay: float = 0.005,
+                 zone: Optional[str] = None):
         """
         Initialize an ARIA node.
 
@@ -77,6 +126,9 @@ class ARIANode:
             key_path: Path to TLS private key (auto-generated if None).
             verify_tls: Verify peer TLS certificates (False for self-signed).
             backend: Inference backend - "auto", "native", or "simulation".
+            batch_size: Max network requests grouped into one inference batch.
+            batch_delay: Seconds to wait for a batch to fill before running it.
+            zone: Deployment zone/rack (defaults to the ARIA_ZONE env var).
         """
         # Generate unique node ID
         self.node_id = node_id or f"aria_{uuid.uuid4().hex[:12]}"
@@ -97,8 +149,14 @@ class ARIANode:
             cert_path=cert_path,
             key_path=key_path,
             verify_tls=verify_tls,
+            zone=zone,
         )
         self.engine = InferenceEngine(node_id=self.node_id, backend=backend)
+        self.batcher = InferenceBatcher(
+            self.engine.infer_batch,
+            batch_size=batch_size,
+            max_delay=batch_delay,
+        )
         self.ledger = ProvenanceLedger(difficulty=2)
         self.pouw = ProofOfUsefulWork()
         self.sobriety = ProofOfSobriety(node_id=self.node_id)
@@ -108,6 +166,19 @@ class ARIANode:
         self.contribution_score = 0.0
         self.start_time: Optional[float] = None
 
+        # Deferred provenance/proof recording (see _record_work)
+        self._proof_queue: Optional[asyncio.Queue] = None
+        self._proof_worker_task: Optional[asyncio.Task] = None
+        self._unconfirmed: Dict[str, asyncio.Future] = {}
+
+        # Outgoing request IDs: random per-process prefix + counter, so
+        # each request costs no urandom read
+        self._request_prefix = secrets.token_hex(4)
+        self._request_counter = itertools.count()
+
+        # (computed_at, stats) from the last get_stats() call
+        self._stats_cache: Optional[Tuple[float, Dict]] = None
+
         # Set inference callback for network requests
         self.network.set_inference_callback(self._handle_network_inference)
 
@@ -150,6 +221,7 @@ class ARIANode:
             port=self.network.port,
             consent=self.consent,
             available_shards=self.network.local_shards,
+            zone=self.network.zone,
         ))
 
         return shard
@@ -170,8 +242,16 @@ class ARIANode:
 
         self.is_running = True
         self.start_time = time.time()
+        self._stats_cache = None
         self.sobriety.start_measurement()
 
+        # Start batching network inference requests
+        self.batcher.start()
+
+        # Record provenance and proofs off the response path
+        self._proof_queue = asyncio.Queue(maxsize=self.PROOF_QUEUE_SIZE)
+        self._proof_worker_task = asyncio.create_task(self._proof_worker())
+
         # Start the network layer
         await self.network.start()
 
@@ -189,9 +269,20 @@ class ARIANode:
             return
 
         self.is_running = False
+        self._stats_cache = None
 
         # Stop network layer
         await self.network.stop()
+        await self.batcher.stop()
+
+        # Let queued work reach the ledger before sealing
+        await self._proof_queue.join()
+        self._proof_worker_task.cancel()
+        try:
+            await self._proof_worker_task
+        except asyncio.CancelledError:
+            pass
+        self._proof_worker_task = None
 
         # Generate final sobriety attestation
         if self.engine.total_inferences > 0:
@@ -227,7 +318,12 @@ class ARIANode:
         model_id = data.get("model_id", "aria-2b-1bit")
         max_tokens = data.get("max_tokens", 100)
 
-        result = self.process_request(query, model_id, max_tokens)
+        if not self.is_running:
+            raise RuntimeError("Node is not running. Call start() first.")
+
+        # Concurrent requests share one batch, run off the event loop
+        result = await self.batcher.submit(query, model_id, max_tokens)
+        self._record_work(query, model_id, result)
 
         return {
             "request_id": result.request_id,
@@ -422,6 +518,10 @@ class ARIANode:
         3. Submit Proof of Useful Work
         4. Update contribution score
 
+        Steps 2-4 run on the background proof worker, so the result is
+        returned before it is on the ledger; use wait_for_confirmation()
+        when the recorded proof is needed.
+
         Args:
             query: The input text/prompt
             model_id: Which model to use
@@ -440,36 +540,97 @@ class ARIANode:
             max_tokens=max_tokens,
         )
 
-        # 2. Record provenance
-        record = result.to_provenance_record(query)
-        self.ledger.add_record(record)
+        # 2-4. Provenance, proof and contribution (deferred)
+        self._record_work(query, model_id, result)
+
+        return result
+
+    def _record_work(self, query: str, model_id: str, result: InferenceResult):
+        """
+        Queue a result for provenance, proof and contribution recording.
+
+        The background proof worker does the recording so ledger sealing
+        does not delay the response. If the queue is full, or the worker
+        is not running, the work is recorded inline instead.
+        """
+        if self._proof_worker_task is None:
+            self._commit_work([(query, model_id, result)])
+            return
+
+        try:
+            self._proof_queue.put_nowait((query, model_id, result))
+        except asyncio.QueueFull:
+            self._commit_work([(query, model_id, result)])
+            return
+
+        self._unconfirmed[result.request_id] = asyncio.get_running_loop().create_future()
+
+    async def _proof_worker(self):
+        """Record queued results in arrival order, everything queued at once."""
+        while True:
+            items = [await self._proof_queue.get()]
+            while not self._proof_queue.empty():
+                items.append(self._proof_queue.get_nowait())
+
+            try:
+                self._commit_work(items)
+            except Exception as e:
+                print(f"[ARIA] Failed to record {len(items)} results: {e}")
+            finally:
+                for _, _, result in items:
+                    confirmation = self._unconfirmed.pop(result.request_id, None)
+                    if confirmation is not None and not confirmation.done():
+                        confirmation.set_result(None)
+                    self._proof_queue.task_done()
+
+    async def wait_for_confirmation(self, request_id: str):
+        """
+        Wait until a processed request is recorded on the ledger and PoUW.
+
+        Returns immediately if the request is already recorded (or unknown).
+        """
+        confirmation = self._unconfirmed.get(request_id)
+        if confirmation is not None:
+            await asyncio.shield(confirmation)
+
+    def _commit_work(self, items: List[Tuple[str, str, InferenceResult]]):
+        """
+        Record provenance, Proof of Useful Work and contribution for results.
+
+        Args:
+            items: (query, model_id, result) tuples, in arrival order
+        """
+        # 2. Record provenance, one ledger append for the whole batch
+        records = [result.to_provenance_record(query) for query, _, result in items]
+        self.ledger.add_records(records)
 
         # 3. Submit Proof of Useful Work
-        proof = self.pouw.create_proof(
-            node_id=self.node_id,
-            inference_id=result.request_id,
-            query_hash=record.query_hash,
-            output_hash=record.output_hash,
-            model_id=model_id,
-            energy_mj=result.energy_mj,
-            latency_ms=result.latency_ms,
-        )
-        self.pouw.submit_proof(proof)
+        self.pouw.submit_proofs([
+            self.pouw.create_proof(
+                node_id=self.node_id,
+                inference_id=result.request_id,
+                query_hash=record.query_hash,
+                output_hash=record.output_hash,
+                model_id=model_id,
+                energy_mj=result.energy_mj,
+                latency_ms=result.latency_ms,
+            )
+            for (_, model_id, result), record in zip(items, records)
+        ])
 
         # 4. Update contribution score
-        score = self._calculate_contribution_score(result)
-        self.contribution_score += score
-
-        return result
+        for _, _, result in items:
+            self.contribution_score += self._calculate_contribution_score(result)
 
-    async def send_inference_request(self, peer_id: str, query: str,
+    async def send_inference_request(self, peer_id: Optional[str], query: str,
                                      model_id: str = "aria-2b-1bit",
                                      max_tokens: int = 100) -> Optional[dict]:
         """
         Send an inference request to a specific peer.
 
         Args:
-            peer_id: The target peer's node ID
+            peer_id: The target peer's node ID, or None to let consistent
+                     hashing pick a peer holding the model
             query: The input text/prompt
             model_id: Which model to use
             max_tokens: Maximum output length
@@ -477,21 +638,18 @@ class ARIANode:
         Returns:
             Response dict with inference result, or None if failed
         """
-        msg = self.network.create_message("inference_request", {
-            "request_id": f"req_{uuid.uuid4().hex[:8]}",
+        if peer_id is None:
+            peer_id = self.network.route_inference_request(query, model_id)
+            if peer_id is None:
+                return None
+
+        return await self.network.request(peer_id, "inference_request", {
+            "request_id": f"req_{self._request_prefix}{next(self._request_counter):08x}",
             "query": query,
             "model_id": model_id,
             "max_tokens": max_tokens,
         })
 
-        response = await self.network.send_to_peer(peer_id, msg)
-        if response:
-            try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                return None
-        return None
-
     def _calculate_contribution_score(self, result: InferenceResult) -> float:
         """
         Calculate contribution score for an inference.
@@ -504,29 +662,25 @@ class ARIANode:
         The contribution score is used for node reputation
         and network quality tracking, not as a currency.
         """
-        base_rate = 0.001  # Base contribution points per inference
-
-        # Quality score: latency-based [0, 1]
-        # Target: <1000ms = perfect, >5000ms = minimum
-        quality = max(0, min(1, 1 - (result.latency_ms - 1000) / 4000))
+        return contribution_score(result.latency_ms, result.energy_mj)
 
-        # Efficiency bonus: energy-based [0.5, 2.0]
-        # Baseline: 150 mJ (GPU equivalent)
-        if result.energy_mj > 0:
-            efficiency = min(2.0, max(0.5, 150 / result.energy_mj))
-        else:
-            efficiency = 1.0
+    def get_stats(self) -> Dict:
+        """
+        Get comprehensive node statistics.
 
-        return base_rate * max(quality, 0.1) * efficiency
+        Repeated calls within STATS_CACHE_TTL return the same dict, so
+        treat the result as read-only.
+        """
+        now = time.monotonic()
+        if self._stats_cache and now - self._stats_cache[0] < self.STATS_CACHE_TTL:
+            return self._stats_cache[1]
 
-    def get_stats(self) -> Dict:
-        """Get comprehensive node statistics."""
         uptime = time.time() - self.start_time if self.start_time else 0
         engine_stats = self.engine.get_stats()
         network_stats = self.network.get_network_stats()
         ledger_stats = self.ledger.get_network_stats()
 
-        return {
+        stats = {
             "node_id": self.node_id,
             "is_running": self.is_running,
             "uptime_seconds": round(uptime),
@@ -538,12 +692,15 @@ class ARIANode:
             "proofs": {
                 "verified": self.pouw.verified_count,
                 "rejected": self.pouw.rejected_count,
+                "cached": self.pouw.cache_size,
             },
             "sobriety": (
                 self.sobriety.get_network_savings()
                 if self.sobriety.attestations else {}
             ),
         }
+        self._stats_cache = (now, stats)
+        return stats
 
     def _get_ledger_stats(self) -> Dict:
         """Get ledger statistics for CLI."""
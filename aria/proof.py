@@ -6,13 +6,48 @@ Proof of Sobriety: Verifiable energy efficiency attestation.
 MIT License - Anthony MURGO, 2026
 """
 
+import bisect
+import functools
 import hashlib
 import json
+import math
 import time
 import os
 import platform
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, fields
+from json.encoder import encode_basestring_ascii as _json_string
+from typing import Optional, Dict, List, Tuple
+
+
+# Invariant for the process lifetime; stamped on every attestation
+_OS_INFO = f"{platform.system()} {platform.release()}"
+
+
+def _canonical_keys(cls) -> Tuple[Tuple[str, str], ...]:
+    """Sorted (JSON key prefix, attribute name) pairs for a dataclass."""
+    names = sorted(f.name for f in fields(cls))
+    return tuple((f"{_json_string(name)}: ", name) for name in names)
+
+
+def _canonical_json(obj, keys: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Serialize a flat dataclass exactly as
+    json.dumps(asdict(obj), sort_keys=True) does, without building the
+    intermediate dict or sorting keys on every call.
+    """
+    parts = []
+    for prefix, name in keys:
+        value = getattr(obj, name)
+        kind = type(value)
+        if kind is str:
+            parts.append(prefix + _json_string(value))
+        elif kind is int or (kind is float and math.isfinite(value)):
+            parts.append(prefix + repr(value))
+        else:
+            parts.append(prefix + json.dumps(value, sort_keys=True))
+    return "{" + ", ".join(parts) + "}"
+
 
 
 @dataclass
@@ -34,9 +69,12 @@ class UsefulWorkProof:
     timestamp: float        # When the work was done
     nonce: int = 0          # For chain inclusion
     
+    # Accepted clock skew / age for a proof's timestamp, in seconds
+    MAX_PROOF_AGE_S = 3600
+    
     def compute_proof_hash(self) -> str:
         """Compute the proof hash."""
-        data = json.dumps(asdict(self), sort_keys=True)
+        data = _canonical_json(self, _PROOF_KEYS)
         return hashlib.sha256(data.encode()).hexdigest()
     
     def verify(self) -> bool:
@@ -51,9 +89,9 @@ class UsefulWorkProof:
         
         This reference implementation does basic structural checks.
         """
-        # Check all required fields are present
-        if not all([self.node_id, self.inference_id, self.query_hash, 
-                    self.output_hash, self.model_id]):
+        # Check all required fields are present (short-circuits, no list)
+        if not (self.node_id and self.inference_id and self.query_hash
+                and self.output_hash and self.model_id):
             return False
         
         # Check energy is reasonable (not suspiciously low or high)
@@ -65,12 +103,15 @@ class UsefulWorkProof:
             return False
         
         # Check timestamp is recent (within 1 hour)
-        if abs(time.time() - self.timestamp) > 3600:
+        if abs(time.time() - self.timestamp) > self.MAX_PROOF_AGE_S:
             return False
         
         return True
 
 
+_PROOF_KEYS = _canonical_keys(UsefulWorkProof)
+
+
 class ProofOfUsefulWork:
     """
     ARIA's Proof of Useful Work consensus mechanism.
@@ -81,14 +122,31 @@ class ProofOfUsefulWork:
 
     Top contributors are identified based on the quantity
     and quality of inference work they've performed.
+
+    Only the most recent MAX_PROOFS accepted proofs are kept, keyed by
+    (node_id, inference_id), so memory stays bounded on long-running
+    nodes and a replayed proof is rejected in O(1).
     """
     
-    def __init__(self, difficulty: int = 2):
+    MAX_PROOFS = 10_000
+    
+    def __init__(self, difficulty: int = 2, max_proofs: Optional[int] = None):
         self.difficulty = difficulty
-        self.proofs: list = []
+        if max_proofs is not None and max_proofs < 0:
+            raise ValueError(f"max_proofs must be >= 0, got {max_proofs}")
+        self.max_proofs = self.MAX_PROOFS if max_proofs is None else max_proofs
+        # (node_id, inference_id) -> proof, oldest first
+        self.proofs: OrderedDict[Tuple[str, str], UsefulWorkProof] = OrderedDict()
+        # node_id -> retained proofs, kept in step with self.proofs
+        self._work_count: Counter[str] = Counter()
         self.verified_count = 0
         self.rejected_count = 0
     
+    @property
+    def cache_size(self) -> int:
+        """Number of recent proofs currently retained."""
+        return len(self.proofs)
+    
     def create_proof(self, node_id: str, inference_id: str,
                      query_hash: str, output_hash: str,
                      model_id: str, energy_mj: int,
@@ -109,34 +167,73 @@ class ProofOfUsefulWork:
     def submit_proof(self, proof: UsefulWorkProof) -> bool:
         """
         Submit a proof for verification and inclusion.
-        Returns True if the proof is accepted.
+        Returns True if the proof is accepted; a proof for an inference
+        already credited to the same node is rejected as a replay.
         """
-        if proof.verify():
-            self.proofs.append(proof)
-            self.verified_count += 1
-            return True
-        else:
+        key = (proof.node_id, proof.inference_id)
+        if key in self.proofs or not proof.verify():
             self.rejected_count += 1
             return False
+        
+        self.proofs[key] = proof
+        self._work_count[proof.node_id] += 1
+        if len(self.proofs) > self.max_proofs:
+            self._trim()
+        self.verified_count += 1
+        return True
+    
+    def submit_proofs(self, proofs: List[UsefulWorkProof]) -> List[bool]:
+        """
+        Submit a batch of proofs, e.g. a validator sweeping pending work.
+
+        Each proof is checked exactly as in submit_proof (a duplicate
+        within the batch counts as a replay), but retention is trimmed
+        once for the whole batch.
+
+        Returns:
+            One acceptance flag per proof, in order
+        """
+        retained = self.proofs
+        work_count = self._work_count
+        accepted = []
+        for proof in proofs:
+            key = (proof.node_id, proof.inference_id)
+            ok = key not in retained and proof.verify()
+            if ok:
+                retained[key] = proof
+                work_count[proof.node_id] += 1
+            accepted.append(ok)
+        
+        verified = accepted.count(True)
+        self.verified_count += verified
+        self.rejected_count += len(accepted) - verified
+        self._trim()
+        return accepted
+    
+    def _trim(self):
+        """Evict the oldest proofs beyond max_proofs."""
+        while len(self.proofs) > self.max_proofs:
+            (node_id, _), _ = self.proofs.popitem(last=False)
+            self._work_count[node_id] -= 1
+            if not self._work_count[node_id]:
+                del self._work_count[node_id]
     
     def select_top_contributor(self) -> Optional[str]:
         """
         Select the top contributing node based on useful work.
 
-        The node with the most verified useful work in the
-        current epoch is identified as the top contributor.
+        The node with the most verified useful work among the
+        retained recent proofs is identified as the top contributor.
         Used for reputation tracking and network quality metrics.
+
+        Per-node counts are maintained as proofs are accepted and
+        evicted, so this is O(nodes) rather than O(proofs).
         """
-        if not self.proofs:
+        if not self._work_count:
             return None
         
-        # Count proofs per node
-        work_count: Dict[str, int] = {}
-        for proof in self.proofs:
-            work_count[proof.node_id] = work_count.get(proof.node_id, 0) + 1
-        
         # Select node with most work
-        return max(work_count, key=work_count.get)
+        return self._work_count.most_common(1)[0][0]
 
 
 @dataclass
@@ -156,14 +253,24 @@ class SobrietyAttestation:
     hardware_type: str        # CPU model/type
     os_info: str              # Operating system
     
-    @property
+    # Upper bounds (exclusive, mJ per inference) for each rating band
+    RATING_THRESHOLDS = (30, 50, 100, 150)
+    RATING_LABELS = (
+        "A+ (Exceptional)",
+        "A (Excellent)",
+        "B (Good)",
+        "C (Average - GPU baseline)",
+        "D (Below average)",
+    )
+    
+    @functools.cached_property
     def energy_per_inference_mj(self) -> float:
-        """Average energy per inference in millijoules."""
+        """Average energy per inference in millijoules (computed once)."""
         if self.total_inferences == 0:
             return 0
         return self.total_energy_mj / self.total_inferences
     
-    @property
+    @functools.cached_property
     def efficiency_rating(self) -> str:
         """
         Human-readable efficiency rating.
@@ -174,23 +281,17 @@ class SobrietyAttestation:
         mj = self.energy_per_inference_mj
         if mj == 0:
             return "N/A"
-        elif mj < 30:
-            return "A+ (Exceptional)"
-        elif mj < 50:
-            return "A (Excellent)"
-        elif mj < 100:
-            return "B (Good)"
-        elif mj < 150:
-            return "C (Average - GPU baseline)"
-        else:
-            return "D (Below average)"
+        return self.RATING_LABELS[bisect.bisect_right(self.RATING_THRESHOLDS, mj)]
     
     def to_hash(self) -> str:
         """Hash for on-chain recording."""
-        data = json.dumps(asdict(self), sort_keys=True)
+        data = _canonical_json(self, _ATTESTATION_KEYS)
         return hashlib.sha256(data.encode()).hexdigest()
 
 
+_ATTESTATION_KEYS = _canonical_keys(SobrietyAttestation)
+
+
 class ProofOfSobriety:
     """
     ARIA's Proof of Sobriety mechanism.
@@ -214,11 +315,38 @@ class ProofOfSobriety:
     # Centralized GPU baseline: ~150 mJ per inference
     GPU_BASELINE_MJ = 150
     
+    # Package-0 RAPL energy counter (microjoules)
+    RAPL_PATH = "/sys/class/powercap/intel-rapl:0/energy_uj"
+    
     def __init__(self, node_id: str):
         self.node_id = node_id
         self.measurement_start: Optional[float] = None
         self.energy_start_mj: Optional[float] = None
         self.attestations: list = []
+        # Running totals over self.attestations for get_network_savings
+        self._total_inferences = 0
+        self._total_energy_mj = 0
+        self._rapl_fd = self._open_rapl()
+    
+    def _open_rapl(self) -> Optional[int]:
+        """Open the RAPL counter once; each read is then a single pread."""
+        if not hasattr(os, "pread"):
+            return None
+        try:
+            return os.open(self.RAPL_PATH, os.O_RDONLY)
+        except OSError:
+            return None
+    
+    def close(self):
+        """Release the RAPL counter file descriptor."""
+        if self._rapl_fd is not None:
+            os.close(self._rapl_fd)
+            self._rapl_fd = None
+    
+    def __del__(self):
+        # __init__ may not have run to completion
+        if getattr(self, "_rapl_fd", None) is not None:
+            self.close()
     
     def start_measurement(self):
         """Begin an energy measurement period."""
@@ -255,10 +383,12 @@ class ProofOfSobriety:
             total_inferences=inferences_done,
             total_energy_mj=max(total_energy, 0),
             hardware_type=self._get_hardware_type(),
-            os_info=f"{platform.system()} {platform.release()}",
+            os_info=_OS_INFO,
         )
         
         self.attestations.append(attestation)
+        self._total_inferences += attestation.total_inferences
+        self._total_energy_mj += attestation.total_energy_mj
         self.measurement_start = None
         self.energy_start_mj = None
         
@@ -271,17 +401,15 @@ class ProofOfSobriety:
         Linux: Intel RAPL (Running Average Power Limit)
         Returns energy in millijoules, or None if unavailable.
         """
-        rapl_path = "/sys/class/powercap/intel-rapl:0/energy_uj"
+        if self._rapl_fd is None:
+            return None
         
         try:
-            if os.path.exists(rapl_path):
-                with open(rapl_path, 'r') as f:
-                    energy_uj = int(f.read().strip())
-                    return energy_uj / 1000.0  # Convert μJ to mJ
-        except (IOError, ValueError):
-            pass
-        
-        return None
+            # sysfs attributes are re-read from offset 0 on every pread
+            energy_uj = int(os.pread(self._rapl_fd, 32, 0).strip())
+            return energy_uj / 1000.0  # Convert μJ to mJ
+        except (OSError, ValueError):
+            return None
     
     def _estimate_energy(self, elapsed_seconds: float, 
                          inferences: int) -> float:
@@ -298,8 +426,10 @@ class ProofOfSobriety:
         # Inference energy is added on top of idle
         return inference_energy + idle_energy * 0.1  # 10% idle overhead
     
-    def _get_hardware_type(self) -> str:
-        """Detect hardware type."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _get_hardware_type() -> str:
+        """Detect hardware type (fixed for the process, so cached)."""
         try:
             if platform.system() == "Linux":
                 with open("/proc/cpuinfo", 'r') as f:
@@ -318,8 +448,8 @@ class ProofOfSobriety:
         if not self.attestations:
             return {"error": "No attestations available"}
         
-        total_inferences = sum(a.total_inferences for a in self.attestations)
-        total_energy = sum(a.total_energy_mj for a in self.attestations)
+        total_inferences = self._total_inferences
+        total_energy = self._total_energy_mj
         
         gpu_equivalent = total_inferences * self.GPU_BASELINE_MJ
         savings = gpu_equivalent - total_energy
@@ -18,6 +18,7 @@ import os
 import platform
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -74,33 +75,73 @@ def _get_simulation_engine(model_id: str):
 # ---------------------------------------------------------------------------
 
 
-def run_backend_benchmark(backend_name, run_fn, prompts, max_tokens):
+def _pin_to_cpu(cpu):
+    """
+    Pin this process (and backends it spawns) to a single CPU.
+
+    Returns True on success; only supported where os.sched_setaffinity
+    exists (Linux).
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+        return True
+    except OSError:
+        return False
+
+
+def _run_prompt(run_fn, prompt, max_tokens):
+    """Run one timed prompt, turning a failure into an error record."""
+    try:
+        metrics = run_fn(prompt, max_tokens)
+        metrics["prompt"] = prompt
+        metrics["status"] = "ok"
+    except Exception as exc:
+        metrics = {
+            "prompt": prompt,
+            "status": "error",
+            "error": str(exc),
+            "tokens_per_second": 0,
+            "latency_ms": 0,
+            "energy_estimate_mj": 0,
+            "energy_mj_per_token": 0,
+            "output_length": 0,
+        }
+    return metrics
+
+
+def run_backend_benchmark(backend_name, run_fn, prompts, max_tokens, warmup=1,
+                          workers=1):
     """
     Run a series of prompts through *run_fn* and collect metrics.
 
     *run_fn(prompt, max_tokens)* must return a dict with at least:
         tokens_per_second, latency_ms, energy_estimate_mj,
         energy_mj_per_token, output_length
+
+    The first *warmup* calls are made untimed on the first prompt so
+    cold-start costs (page-in, lazy initialisation) stay out of the
+    reported latencies. Errors during warm-up are ignored; the timed
+    runs record them.
+
+    With *workers* > 1 the prompts run concurrently on a thread pool;
+    only use this for backends whose *run_fn* is thread-safe. Results
+    keep prompt order either way.
     """
-    results = []
-    for prompt in prompts:
-        try:
-            metrics = run_fn(prompt, max_tokens)
-            metrics["prompt"] = prompt
-            metrics["status"] = "ok"
-        except Exception as exc:
-            metrics = {
-                "prompt": prompt,
-                "status": "error",
-                "error": str(exc),
-                "tokens_per_second": 0,
-                "latency_ms": 0,
-                "energy_estimate_mj": 0,
-                "energy_mj_per_token": 0,
-                "output_length": 0,
-            }
-        results.append(metrics)
-    return results
+    if prompts:
+        for _ in range(warmup):
+            try:
+                run_fn(prompts[0], max_tokens)
+            except Exception:
+                pass
+
+    if workers > 1 and len(prompts) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(prompts))) as pool:
+            return list(pool.map(
+                lambda prompt: _run_prompt(run_fn, prompt, max_tokens), prompts))
+
+    return [_run_prompt(run_fn, prompt, max_tokens) for prompt in prompts]
 
 
 # ---------------------------------------------------------------------------
@@ -114,9 +155,9 @@ def _make_native_fn(native_instance, model_id):
     native_instance.load_model(model_id, auto_download=False)
 
     def _run(prompt, max_tokens):
-        start = time.time()
+        start = time.perf_counter_ns()
         output = native_instance.generate(prompt, max_tokens=max_tokens)
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
         tokens_generated = max_tokens  # approximate
         tps = tokens_generated / (elapsed_ms / 1000) if elapsed_ms > 0 else 0
         energy_mj = 28.0  # baseline estimate for native
@@ -154,9 +195,9 @@ def _make_subprocess_fn(subprocess_instance, model_id):
 def _make_simulation_fn(engine, model_id):
     """Build a run function for the simulation backend."""
     def _run(prompt, max_tokens):
-        start = time.time()
+        start = time.perf_counter_ns()
         res = engine.infer(query=prompt, model_id=model_id, max_tokens=max_tokens)
-        elapsed_ms = (time.time() - start) * 1000
+        elapsed_ms = (time.perf_counter_ns() - start) / 1e6
         return {
             "tokens_per_second": float("inf"),
             "latency_ms": round(elapsed_ms, 2),
@@ -172,10 +213,6 @@ def _make_simulation_fn(engine, model_id):
 # ---------------------------------------------------------------------------
 
 
-def _avg(values):
-    return sum(values) / len(values) if values else 0
-
-
 def print_summary(all_results, model_id, num_prompts, max_tokens):
     """Print a formatted comparison table to stdout."""
     print()
@@ -186,14 +223,23 @@ def print_summary(all_results, model_id, num_prompts, max_tokens):
     print("-" * 58)
 
     for backend_name, results in all_results.items():
-        ok = [r for r in results if r["status"] == "ok"]
-        if not ok:
+        # One pass over the results, accumulating all three sums
+        count = 0
+        tps_sum = lat_sum = nrg_sum = 0.0
+        for r in results:
+            if r["status"] == "ok":
+                count += 1
+                tps_sum += r["tokens_per_second"]
+                lat_sum += r["latency_ms"]
+                nrg_sum += r["energy_estimate_mj"]
+
+        if not count:
             print(f"{backend_name:<17}{'-':>10}{'-':>14}{'-':>13}   unavailable")
             continue
 
-        avg_tps = _avg([r["tokens_per_second"] for r in ok])
-        avg_lat = _avg([r["latency_ms"] for r in ok])
-        avg_nrg = _avg([r["energy_estimate_mj"] for r in ok])
+        avg_tps = tps_sum / count
+        avg_lat = lat_sum / count
+        avg_nrg = nrg_sum / count
 
         if avg_tps == float("inf"):
             tps_str = "inf"
@@ -290,6 +336,20 @@ def create_parser():
         "--model", type=str, default="bitnet-b1.58-large",
         help="Model to benchmark (default: bitnet-b1.58-large)",
     )
+    parser.add_argument(
+        "--warmup", type=int, default=1,
+        help="Untimed warm-up runs per backend (default: 1)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="Concurrent prompts for the subprocess backend; latencies then "
+             "include contention (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--pin-cpu", type=int, default=None,
+        help="Pin the benchmark to this CPU to reduce scheduler noise "
+             "(Linux only; default: no pinning)",
+    )
     return parser
 
 
@@ -304,6 +364,11 @@ def main():
     print("=" * 58)
     print(f"Model: {model_id}")
     print(f"Prompts: {len(prompts)} | Max tokens: {args.max_tokens} | Threads: {args.threads}")
+    if args.pin_cpu is not None:
+        if _pin_to_cpu(args.pin_cpu):
+            print(f"Pinned to CPU {args.pin_cpu}")
+        else:
+            print("CPU pinning unavailable on this platform, running unpinned")
     print()
 
     # ------------------------------------------------------------------
@@ -319,7 +384,8 @@ def main():
         try:
             fn = _make_native_fn(native, model_id)
             print(f"  Running {len(prompts)} prompts on native backend...")
-            all_results["native"] = run_backend_benchmark("native", fn, prompts, args.max_tokens)
+            all_results["native"] = run_backend_benchmark(
+                "native", fn, prompts, args.max_tokens, args.warmup)
         except Exception as exc:
             print(f"  Skipped (model load failed: {exc})")
             all_results["native"] = [{"status": "error", "error": str(exc)}]
@@ -335,7 +401,9 @@ def main():
         try:
             fn = _make_subprocess_fn(sub, model_id)
             print(f"  Running {len(prompts)} prompts on subprocess backend...")
-            all_results["subprocess"] = run_backend_benchmark("subprocess", fn, prompts, args.max_tokens)
+            all_results["subprocess"] = run_backend_benchmark(
+                "subprocess", fn, prompts, args.max_tokens, args.warmup,
+                workers=args.jobs)
         except Exception as exc:
             print(f"  Skipped ({exc})")
             all_results["subprocess"] = [{"status": "error", "error": str(exc)}]
@@ -348,7 +416,8 @@ def main():
     engine = _get_simulation_engine(model_id)
     fn = _make_simulation_fn(engine, model_id)
     print(f"  Running {len(prompts)} prompts on simulation backend...")
-    all_results["simulation"] = run_backend_benchmark("simulation", fn, prompts, args.max_tokens)
+    all_results["simulation"] = run_backend_benchmark(
+        "simulation", fn, prompts, args.max_tokens, args.warmup)
 
     # ------------------------------------------------------------------
     # Display summary
@@ -362,7 +431,8 @@ def main():
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     report = build_json_report(all_results, model_id, len(prompts), args.max_tokens, args.threads)
-    output_path.write_text(json.dumps(report, indent=2))
+    with output_path.open("w") as fp:
+        json.dump(report, fp, indent=2)
     print(f"Results saved to {output_path}")
 
     return 0
@@ -13,6 +13,10 @@ MIT License - Anthony MURGO, 2026
 """
 
 import argparse
+import asyncio
+import functools
+import gzip
+import itertools
 import json
 import os
 import platform
@@ -21,8 +25,12 @@ import resource
 import statistics
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass, asdict
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
@@ -34,6 +42,26 @@ from aria.node import ARIANode
 from aria.consent import ARIAConsent, TaskType
 from aria.inference import InferenceEngine
 
+# Optional fast JSON encoder (pip install aria-protocol[fast]); reports
+# can run to tens of MB of floats on long runs.
+try:
+    import orjson
+
+    def _dump_report(report: Dict[str, Any]) -> bytes:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+
+    def _dump_line(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record) + b"\n"
+except ImportError:
+    def _dump_report(report: Dict[str, Any]) -> bytes:
+        return json.dumps(report, indent=2).encode()
+
+    def _dump_line(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record) + "\n").encode()
+
+
+# Bytes per page for /proc/self/statm, which counts pages
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
 
 # Default test prompts for reproducibility
 DEFAULT_PROMPTS = [
@@ -58,8 +86,14 @@ class BenchmarkConfig:
     seed: int = 42
     model: str = "aria-2b-1bit"
     warmup: int = 5
+    batch_size: int = 1
+    autotune_batch: bool = False
+    workers: int = 1
+    async_pipeline: bool = False
+    candidate_batch_sizes: List[int] = field(default_factory=lambda: [1, 2, 4, 8, 16])
     tdp_watts: Optional[float] = None
     compare_bitnet: bool = False
+    raw_file: bool = False
     verbose: bool = False
     prompts: List[str] = None
 
@@ -80,9 +114,20 @@ class BenchmarkResults:
     avg_ram_mb: float
     total_tokens: int
     total_time_sec: float
-    latencies_ms: List[float]
-    tokens_per_request: List[int]
-    ram_samples_mb: List[float]
+    # Raw samples stay unrounded in unboxed arrays; see BenchmarkResults.raw_data
+    latencies_ms: array
+    tokens_per_request: array
+    ram_samples_mb: array
+    batch_latencies_ms: array = field(default_factory=lambda: array("d"))
+
+    def raw_data(self) -> Dict[str, List[float]]:
+        """Raw samples as JSON-ready lists, at full precision."""
+        return {
+            "latencies_ms": self.latencies_ms.tolist(),
+            "tokens_per_request": self.tokens_per_request.tolist(),
+            "ram_samples_mb": self.ram_samples_mb.tolist(),
+            "batch_latencies_ms": self.batch_latencies_ms.tolist(),
+        }
 
 
 @dataclass
@@ -97,45 +142,93 @@ class EnvironmentInfo:
     aria_version: str
 
 
-def get_cpu_info() -> str:
-    """Get CPU model name."""
+@dataclass
+class SystemMetadata:
+    """Host facts that may need a subprocess to collect."""
+    git_commit: Optional[str]
+    cpu: str
+    ram_gb: float
+
+
+# One line each: git commit, CPU brand, RAM bytes. Empty on failure so
+# the line count stays fixed.
+_DARWIN_METADATA_SCRIPT = (
+    "git rev-parse --short HEAD 2>/dev/null || echo; "
+    "sysctl -n machdep.cpu.brand_string 2>/dev/null || echo; "
+    "sysctl -n hw.memsize 2>/dev/null || echo"
+)
+
+
+def _read_proc_cpu() -> str:
+    with open("/proc/cpuinfo") as f:
+        for line in f:
+            if "model name" in line:
+                return line.split(":")[1].strip()
+    return ""
+
+
+def _read_proc_ram_gb() -> float:
+    with open("/proc/meminfo") as f:
+        for line in f:
+            if "MemTotal" in line:
+                kb = int(line.split()[1])
+                return kb / (1024 * 1024)
+    return 0.0
+
+
+@functools.lru_cache(maxsize=1)
+def _collect_system_metadata() -> SystemMetadata:
+    """
+    Collect git commit, CPU model and total RAM with at most one fork.
+
+    Linux reads CPU and RAM from /proc, so only git is spawned; macOS
+    gets all three from a single shell invocation.
+    """
+    repo_dir = Path(__file__).parent.parent
+    git_commit = None
+    cpu = ""
+    ram_gb = 0.0
     try:
-        if platform.system() == "Linux":
-            with open("/proc/cpuinfo") as f:
-                for line in f:
-                    if "model name" in line:
-                        return line.split(":")[1].strip()
-        elif platform.system() == "Darwin":
+        if platform.system() == "Darwin":
             result = subprocess.run(
-                ["sysctl", "-n", "machdep.cpu.brand_string"],
-                capture_output=True, text=True
+                ["sh", "-c", _DARWIN_METADATA_SCRIPT],
+                capture_output=True, text=True, cwd=repo_dir
             )
-            return result.stdout.strip()
+            lines = (result.stdout.splitlines() + ["", "", ""])[:3]
+            git_commit = lines[0].strip() or None
+            cpu = lines[1].strip()
+            if lines[2].strip():
+                ram_gb = int(lines[2]) / (1024**3)
+        else:
+            result = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True, text=True, cwd=repo_dir
+            )
+            if result.returncode == 0:
+                git_commit = result.stdout.strip()
+            if platform.system() == "Linux":
+                cpu = _read_proc_cpu()
+                ram_gb = _read_proc_ram_gb()
     except Exception:
         pass
-    return platform.processor() or "Unknown CPU"
+    return SystemMetadata(
+        git_commit=git_commit,
+        cpu=cpu or platform.processor() or "Unknown CPU",
+        ram_gb=ram_gb,
+    )
+
+
+def get_cpu_info() -> str:
+    """Get CPU model name."""
+    return _collect_system_metadata().cpu
 
 
 def get_ram_gb() -> float:
     """Get total RAM in GB."""
-    try:
-        if platform.system() == "Linux":
-            with open("/proc/meminfo") as f:
-                for line in f:
-                    if "MemTotal" in line:
-                        kb = int(line.split()[1])
-                        return kb / (1024 * 1024)
-        elif platform.system() == "Darwin":
-            result = subprocess.run(
-                ["sysctl", "-n", "hw.memsize"],
-                capture_output=True, text=True
-            )
-            return int(result.stdout.strip()) / (1024**3)
-    except Exception:
-        pass
-    return 0.0
+    return _collect_system_metadata().ram_gb
 
 
+@functools.lru_cache(maxsize=1)
 def get_environment_info() -> EnvironmentInfo:
     """Collect environment information."""
     try:
@@ -156,17 +249,7 @@ def get_environment_info() -> EnvironmentInfo:
 
 def get_git_commit() -> Optional[str]:
     """Get current git commit hash."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--short", "HEAD"],
-            capture_output=True, text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception:
-        pass
-    return None
+    return _collect_system_metadata().git_commit
 
 
 def estimate_tdp(cpu_name: str) -> float:
@@ -190,8 +273,8 @@ def estimate_tdp(cpu_name: str) -> float:
         return 65.0  # Default assumption
 
 
-def get_current_ram_mb() -> float:
-    """Get current process RAM usage in MB."""
+def get_peak_rss_mb() -> float:
+    """Get the process's peak RAM usage (high-water mark) in MB."""
     try:
         usage = resource.getrusage(resource.RUSAGE_SELF)
         # maxrss is in KB on Linux, bytes on macOS
@@ -202,36 +285,186 @@ def get_current_ram_mb() -> float:
         return 0.0
 
 
-def percentile(data: List[float], p: float) -> float:
-    """Calculate percentile of data."""
+def get_current_rss_mb() -> float:
+    """
+    Get current process RAM usage (resident set) in MB.
+
+    Reads /proc/self/statm on Linux; elsewhere only the peak is
+    available, so it falls back to get_peak_rss_mb().
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return get_peak_rss_mb()
+
+
+def percentiles(data: List[float], ps: List[float]) -> List[float]:
+    """Calculate several percentiles of data from a single sort."""
     if not data:
-        return 0.0
+        return [0.0] * len(ps)
     sorted_data = sorted(data)
-    k = (len(sorted_data) - 1) * (p / 100)
-    f = int(k)
-    c = f + 1 if f + 1 < len(sorted_data) else f
-    return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f])
+    last = len(sorted_data) - 1
+    values = []
+    for p in ps:
+        k = last * (p / 100)
+        f = int(k)
+        c = f + 1 if f < last else f
+        values.append(sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f]))
+    return values
 
 
-def check_bitnet_available() -> bool:
-    """Check if bitnet.cpp is available."""
-    try:
-        result = subprocess.run(
-            ["which", "bitnet"],
-            capture_output=True
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+def percentile(data: List[float], p: float) -> float:
+    """Calculate percentile of data."""
+    return percentiles(data, [p])[0]
+
+
+class RAMSampler:
+    """
+    Sample process RAM from a background thread at a fixed cadence.
+
+    Keeps the sampling syscall out of the timed benchmark loop. One
+    sample is always taken at start and one at stop, so short runs
+    still report RAM.
+    """
+
+    def __init__(self, interval_s: float = 0.05):
+        self.interval_s = interval_s
+        self.samples_mb = array("d")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Begin sampling."""
+        self._stop.clear()
+        self.samples_mb.append(get_current_rss_mb())
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and take a final sample."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.samples_mb.append(get_current_rss_mb())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval_s):
+            self.samples_mb.append(get_current_rss_mb())
+
+
+def write_report(report: Dict[str, Any], output_path: Path, compress: bool = False) -> Path:
+    """
+    Write the JSON report, gzipped when *compress* is set.
+
+    Returns the path actually written, which gains a .gz suffix when
+    compressing.
+    """
+    data = _dump_report(report)
+    if compress:
+        output_path = output_path.with_name(output_path.name + ".gz")
+        with gzip.open(output_path, "wb", compresslevel=1) as f:
+            f.write(data)
+    else:
+        output_path.write_bytes(data)
+    return output_path
+
+
+def write_raw_samples(results: Dict[str, "BenchmarkResults"], output_path: Path,
+                      compress: bool = False, chunk_size: int = 4096) -> Path:
+    """
+    Stream raw samples to a JSON Lines sidecar, one record per line.
+
+    Records carry the backend name and a kind: "request" (index,
+    latency and tokens), "batch" (index and latency) or "ram" (one
+    sample). Lines are encoded and written chunk_size at a time so the
+    samples are never materialized as JSON lists. Returns the path
+    written, with a .gz suffix when compressing.
+    """
+    if compress:
+        output_path = output_path.with_name(output_path.name + ".gz")
+        fh = gzip.open(output_path, "wb", compresslevel=1)
+    else:
+        fh = open(output_path, "wb", buffering=1024 * 1024)
+
+    with fh:
+        for backend, res in results.items():
+            records = itertools.chain(
+                ({"backend": backend, "kind": "request", "i": i, "latency_ms": lat, "tokens": tok}
+                 for i, (lat, tok) in enumerate(zip(res.latencies_ms, res.tokens_per_request))),
+                ({"backend": backend, "kind": "batch", "i": i, "latency_ms": lat}
+                 for i, lat in enumerate(res.batch_latencies_ms)),
+                ({"backend": backend, "kind": "ram", "ram_mb": ram}
+                 for ram in res.ram_samples_mb),
+            )
+            while chunk := list(itertools.islice(records, chunk_size)):
+                fh.write(b"".join(map(_dump_line, chunk)))
+    return output_path
+
+
+def _samples(typecode: str, count: int) -> array:
+    """Zero-filled array for *count* benchmark samples."""
+    return array(typecode, bytes(array(typecode).itemsize * count))
+
+
+# Per-process engine for --workers runs, built once by _init_worker
+_worker_engine: Optional[InferenceEngine] = None
+
+
+def _init_worker(model_id: str, seed: int):
+    """Build the worker's engine once, before any request is timed."""
+    global _worker_engine
+    random.seed(seed)
+    _worker_engine = InferenceEngine(node_id=f"benchmark-{os.getpid()}")
+    _worker_engine.load_model(
+        model_id=model_id,
+        num_layers=24,
+        hidden_dim=2048,
+        shard_start=0,
+        shard_end=23
+    )
+
+
+def request_seeds(seed: int, count: int) -> List[int]:
+    """
+    Derive one independent seed per request from the run seed.
+
+    Seeds are tied to the request index rather than to whichever
+    worker happens to run it, so results do not depend on --workers.
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+
+def _run_one(prompt: str, model_id: str, max_tokens: int, seed: Optional[int] = None):
+    """Run one timed inference in a worker: (latency_ms, tokens, ram_mb)."""
+    if seed is not None:
+        random.seed(seed)
+    start = time.perf_counter()
+    result = _worker_engine.infer(query=prompt, model_id=model_id, max_tokens=max_tokens)
+    latency_ms = (time.perf_counter() - start) * 1000
+    return latency_ms, result.tokens_generated, get_current_rss_mb()
 
 
 class ARIABenchmark:
     """ARIA Protocol benchmark runner."""
 
+    WARMUP_WINDOW = 5             # Latencies considered for warmup stability
+    WARMUP_CV_TARGET = 0.05       # Stop warming once stdev/mean falls below this
+    WARMUP_MAX_ITERATIONS = 20    # Warmup cap when config.warmup is smaller
+
     def __init__(self, config: BenchmarkConfig):
         self.config = config
         self.engine: Optional[InferenceEngine] = None
         self.node: Optional[ARIANode] = None
+        self.warmup_autotune: List[Dict[str, float]] = []
+        self.warmup_iterations_actual = 0
+        self.results: Dict[str, BenchmarkResults] = {}
+        # Host facts are fixed for the run; collect them outside the timed region
+        self._env = get_environment_info()
+        self._tdp = self.config.tdp_watts or estimate_tdp(self._env.cpu)
 
     def setup(self):
         """Initialize the inference engine."""
@@ -266,112 +499,360 @@ class ARIABenchmark:
             print(f"Layers: {shard.layer_start}-{shard.layer_end}")
 
     def warmup(self):
-        """Run warmup iterations."""
+        """
+        Run warmup iterations until latency settles.
+
+        At least config.warmup iterations run; warmup then stops once
+        the coefficient of variation of the last WARMUP_WINDOW
+        latencies drops below WARMUP_CV_TARGET, or after
+        max(config.warmup, WARMUP_MAX_ITERATIONS) iterations. A warmup
+        of 0 skips it entirely.
+        """
+        minimum = self.config.warmup
+        limit = max(minimum, self.WARMUP_MAX_ITERATIONS) if minimum > 0 else 0
         if self.config.verbose:
-            print(f"\nRunning {self.config.warmup} warmup iterations...")
+            print(f"\nRunning {minimum}-{limit} warmup iterations...")
 
+        recent = deque(maxlen=self.WARMUP_WINDOW)
+        prompt_iter = itertools.cycle(self.config.prompts)
         prompt_idx = 0
-        for i in range(self.config.warmup):
-            prompt = self.config.prompts[prompt_idx % len(self.config.prompts)]
+        settled = False
+        while prompt_idx < limit:
+            prompt = next(prompt_iter)
+            start = time.perf_counter()
             self.engine.infer(
                 query=prompt,
                 model_id=self.config.model,
                 max_tokens=self.config.max_tokens
             )
+            recent.append(time.perf_counter() - start)
             prompt_idx += 1
 
-    def run_simulation_benchmark(self) -> BenchmarkResults:
-        """Run benchmark in simulation mode."""
-        latencies_ms: List[float] = []
-        tokens_per_request: List[int] = []
-        ram_samples_mb: List[float] = []
+            if prompt_idx >= minimum and len(recent) == recent.maxlen:
+                mean = statistics.fmean(recent)
+                if mean > 0 and statistics.stdev(recent) / mean < self.WARMUP_CV_TARGET:
+                    settled = True
+                    break
 
-        total_tokens = 0
-        prompt_idx = 0
+        self.warmup_iterations_actual = prompt_idx
+        if self.config.verbose and prompt_idx:
+            outcome = "settled" if settled else "stopped at the cap"
+            print(f"  Warmup {outcome} after {prompt_idx} iterations")
+
+        if self.config.autotune_batch:
+            self.autotune_batch_size()
+
+    def autotune_batch_size(self, rounds: int = 2) -> int:
+        """
+        Pick the batch size with the best warm throughput.
+
+        Each candidate in config.candidate_batch_sizes runs *rounds*
+        batches; the fastest in tokens/s becomes config.batch_size for
+        the timed run. The measured curve is kept in warmup_autotune.
+        """
+        self.warmup_autotune = []
+        for size in self.config.candidate_batch_sizes:
+            batch = [
+                (prompt, self.config.model, self.config.max_tokens)
+                for prompt in itertools.islice(itertools.cycle(self.config.prompts), size)
+            ]
+            tokens = 0
+            start = time.perf_counter()
+            for _ in range(rounds):
+                results = self.engine.infer_batch(batch)
+                tokens += sum(r.tokens_generated for r in results)
+            elapsed = time.perf_counter() - start
+            tps = tokens / elapsed if elapsed > 0 else 0.0
+            self.warmup_autotune.append({"batch_size": size, "tokens_per_sec": round(tps, 2)})
+            if self.config.verbose:
+                print(f"  Batch size {size:>3}: {tps:.2f} tokens/s")
+
+        if self.warmup_autotune:
+            best = max(self.warmup_autotune, key=lambda c: c["tokens_per_sec"])
+            self.config.batch_size = best["batch_size"]
+        return self.config.batch_size
+
+    def run_simulation_benchmark(self) -> BenchmarkResults:
+        """
+        Run benchmark in simulation mode.
+
+        Prompts are dispatched to the engine in batches of
+        config.batch_size. Every request in a batch waits for the whole
+        batch, so each is recorded with the batch's full wall time and
+        the latency percentiles reflect what a caller sees; the
+        per-batch times are also kept in batch_latencies_ms. Throughput
+        is total tokens over total time. With config.async_pipeline the next batch
+        is prepared while the current one runs (see _run_pipelined);
+        with config.workers > 1 the requests run on a process pool
+        instead (see _run_in_workers).
+        """
+        # Samples are written in place into preallocated unboxed arrays
+        iterations = self.config.iterations
+        latencies_ms = _samples("d", iterations)
+        tokens_per_request = _samples("q", iterations)
 
         if self.config.verbose:
-            print(f"\nRunning {self.config.iterations} benchmark iterations...")
+            print(f"\nRunning {iterations} benchmark iterations...")
+
+        if self.config.workers > 1:
+            return self._run_in_workers(
+                latencies_ms, tokens_per_request, _samples("d", iterations))
+
+        batch_size = max(1, self.config.batch_size)
+        num_batches = -(-iterations // batch_size)
+        batch_latencies_ms = _samples("d", num_batches)
 
+        # RAM is sampled off the timed path by a background thread
+        sampler = RAMSampler()
+        sampler.start()
         start_time = time.perf_counter()
+        if self.config.async_pipeline:
+            total_tokens = asyncio.run(self._run_pipelined(
+                latencies_ms, batch_latencies_ms, tokens_per_request))
+        else:
+            total_tokens = self._run_batches(
+                latencies_ms, batch_latencies_ms, tokens_per_request)
+        end_time = time.perf_counter()
+        sampler.stop()
 
-        for i in range(self.config.iterations):
-            prompt = self.config.prompts[prompt_idx % len(self.config.prompts)]
-            prompt_idx += 1
+        return self._build_results(
+            end_time - start_time, total_tokens, latencies_ms,
+            tokens_per_request, sampler.samples_mb, batch_latencies_ms,
+            peak_ram_mb=get_peak_rss_mb())
 
-            # Measure single inference
+    def _iter_batches(self):
+        """Yield (batch index, index of its first request, batch) in order."""
+        batch_size = max(1, self.config.batch_size)
+        prompt_iter = itertools.cycle(self.config.prompts)
+        prompt_idx = 0
+        batch_idx = 0
+        while prompt_idx < self.config.iterations:
+            count = min(batch_size, self.config.iterations - prompt_idx)
+            batch = [
+                (prompt, self.config.model, self.config.max_tokens)
+                for prompt in itertools.islice(prompt_iter, count)
+            ]
+            yield batch_idx, prompt_idx, batch
+            batch_idx += 1
+            prompt_idx += count
+
+    def _record_batch(self, latencies_ms: array, batch_latencies_ms: array,
+                      tokens_per_request: array, batch_idx: int, first: int,
+                      batch_ms: float, results) -> int:
+        """Store one batch's samples; returns the tokens it generated."""
+        batch_latencies_ms[batch_idx] = batch_ms
+
+        tokens_total = 0
+        for k, result in enumerate(results, first):
+            tokens = result.tokens_generated
+            # A request's result is only available once its batch finishes
+            latencies_ms[k] = batch_ms
+            tokens_per_request[k] = tokens
+            tokens_total += tokens
+
+        done = first + len(results)
+        if self.config.verbose and done // 10 > first // 10:
+            print(f"  Progress: {done}/{self.config.iterations}")
+        return tokens_total
+
+    def _run_batches(self, latencies_ms: array, batch_latencies_ms: array,
+                     tokens_per_request: array) -> int:
+        """Run all iterations in-process; returns the total tokens generated."""
+        total_tokens = 0
+        for batch_idx, first, batch in self._iter_batches():
+            # Measure one batch of inferences
             iter_start = time.perf_counter()
 
-            result = self.engine.infer(
-                query=prompt,
-                model_id=self.config.model,
-                max_tokens=self.config.max_tokens
-            )
+            results = self.engine.infer_batch(batch)
 
             iter_end = time.perf_counter()
 
-            # Record metrics
-            latency_ms = (iter_end - iter_start) * 1000
-            latencies_ms.append(latency_ms)
+            total_tokens += self._record_batch(
+                latencies_ms, batch_latencies_ms, tokens_per_request,
+                batch_idx, first, (iter_end - iter_start) * 1000, results)
 
-            tokens = result.tokens_generated
-            tokens_per_request.append(tokens)
-            total_tokens += tokens
+        return total_tokens
 
-            # Sample RAM
-            ram_mb = get_current_ram_mb()
-            ram_samples_mb.append(ram_mb)
+    async def _run_pipelined(self, latencies_ms: array, batch_latencies_ms: array,
+                             tokens_per_request: array) -> int:
+        """
+        Run all iterations with batch preparation overlapped with inference.
 
-            if self.config.verbose and (i + 1) % 10 == 0:
-                print(f"  Progress: {i + 1}/{self.config.iterations}")
+        A producer coroutine queues upcoming batches while the runner
+        awaits the engine on the default executor; latency is measured
+        in the runner around each engine call only.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async def producer():
+            for item in self._iter_batches():
+                await queue.put(item)
+            await queue.put(None)
+
+        async def runner() -> int:
+            total_tokens = 0
+            while (item := await queue.get()) is not None:
+                batch_idx, first, batch = item
+                iter_start = time.perf_counter()
+                results = await loop.run_in_executor(None, self.engine.infer_batch, batch)
+                iter_end = time.perf_counter()
+                total_tokens += self._record_batch(
+                    latencies_ms, batch_latencies_ms, tokens_per_request,
+                    batch_idx, first, (iter_end - iter_start) * 1000, results)
+            return total_tokens
+
+        _, total_tokens = await asyncio.gather(producer(), runner())
+        return total_tokens
+
+    def _run_in_workers(self, latencies_ms: array, tokens_per_request: array,
+                        ram_samples_mb: array) -> BenchmarkResults:
+        """
+        Run all iterations on a pool of config.workers processes.
 
-        end_time = time.perf_counter()
-        total_time = end_time - start_time
+        Each worker builds its own engine once; latency and RAM are
+        measured inside the worker per request. Every request is seeded
+        from request_seeds(), so runs reproduce for any worker count.
+        Pool start-up and one warm request per worker happen before the
+        clock starts.
+        """
+        prompts = list(itertools.islice(
+            itertools.cycle(self.config.prompts), self.config.iterations))
+        seeds = request_seeds(self.config.seed, len(prompts))
+        model_id = self.config.model
+        max_tokens = self.config.max_tokens
+
+        with ProcessPoolExecutor(
+            max_workers=self.config.workers,
+            initializer=_init_worker,
+            initargs=(model_id, self.config.seed),
+        ) as pool:
+            list(pool.map(_run_one, prompts[:self.config.workers],
+                          [model_id] * self.config.workers,
+                          [max_tokens] * self.config.workers))
+
+            start_time = time.perf_counter()
+            total_tokens = 0
+            samples = pool.map(_run_one, prompts, [model_id] * len(prompts),
+                               [max_tokens] * len(prompts), seeds)
+            for k, (latency_ms, tokens, ram_mb) in enumerate(samples):
+                latencies_ms[k] = latency_ms
+                tokens_per_request[k] = tokens
+                ram_samples_mb[k] = ram_mb
+                total_tokens += tokens
+            end_time = time.perf_counter()
+
+        return self._build_results(
+            end_time - start_time, total_tokens, latencies_ms,
+            tokens_per_request, ram_samples_mb, _samples("d", 0))
+
+    def _build_results(self, total_time: float, total_tokens: int,
+                       latencies_ms: array, tokens_per_request: array,
+                       ram_samples_mb: array, batch_latencies_ms: array,
+                       peak_ram_mb: Optional[float] = None) -> BenchmarkResults:
+        """
+        Summarize raw samples into BenchmarkResults.
 
+        peak_ram_mb defaults to the largest RAM sample when the caller
+        has no better high-water mark.
+        """
+        if peak_ram_mb is None:
+            peak_ram_mb = max(ram_samples_mb) if ram_samples_mb else 0
         # Calculate metrics
         throughput = total_tokens / total_time if total_time > 0 else 0
 
         # Energy estimation
-        env = get_environment_info()
-        tdp = self.config.tdp_watts or estimate_tdp(env.cpu)
+        tdp = self._tdp
         # Estimate CPU utilization during inference (assume 50% average)
         cpu_utilization = 0.5
         energy_joules = total_time * tdp * cpu_utilization
         energy_mj = energy_joules * 1000
         energy_per_token = energy_mj / total_tokens if total_tokens > 0 else 0
 
+        p50, p95, p99 = percentiles(latencies_ms, [50, 95, 99])
+
         return BenchmarkResults(
             throughput_tokens_per_sec=round(throughput, 2),
             energy_mj_per_token=round(energy_per_token, 2),
-            latency_p50_ms=round(percentile(latencies_ms, 50), 2),
-            latency_p95_ms=round(percentile(latencies_ms, 95), 2),
-            latency_p99_ms=round(percentile(latencies_ms, 99), 2),
-            peak_ram_mb=round(max(ram_samples_mb) if ram_samples_mb else 0, 1),
-            avg_ram_mb=round(statistics.mean(ram_samples_mb) if ram_samples_mb else 0, 1),
+            latency_p50_ms=round(p50, 2),
+            latency_p95_ms=round(p95, 2),
+            latency_p99_ms=round(p99, 2),
+            peak_ram_mb=round(peak_ram_mb, 1),
+            avg_ram_mb=round(statistics.fmean(ram_samples_mb) if ram_samples_mb else 0, 1),
             total_tokens=total_tokens,
             total_time_sec=round(total_time, 3),
-            latencies_ms=[round(l, 2) for l in latencies_ms],
+            latencies_ms=latencies_ms,
             tokens_per_request=tokens_per_request,
-            ram_samples_mb=[round(r, 1) for r in ram_samples_mb],
+            ram_samples_mb=ram_samples_mb,
+            batch_latencies_ms=batch_latencies_ms,
         )
 
     def run_bitnet_benchmark(self) -> Optional[BenchmarkResults]:
-        """Run benchmark with bitnet.cpp (if available)."""
-        if not check_bitnet_available():
+        """
+        Run benchmark with bitnet.cpp via the llama-cli subprocess backend.
+
+        The executable and model are resolved once up front. Requests run
+        on config.workers threads; each blocks on its own llama-cli child,
+        so with more than one worker the per-request process start-up
+        and model load overlap instead of adding up.
+
+        Returns None if llama-cli or the model is not available locally.
+        """
+        from aria.bitnet_subprocess import BitNetSubprocess
+
+        backend = BitNetSubprocess()
+        if not backend.is_available or backend.get_model_path(self.config.model) is None:
+            if self.config.verbose:
+                print("\nbitnet.cpp (llama-cli) or model not available, skipping")
             return None
 
-        # This would integrate with actual bitnet.cpp
-        # For now, return None as it's not yet integrated
+        iterations = self.config.iterations
+        prompts = list(itertools.islice(itertools.cycle(self.config.prompts), iterations))
+        latencies_ms = _samples("d", iterations)
+        tokens_per_request = _samples("q", iterations)
+
+        def run_one(prompt: str):
+            start = time.perf_counter()
+            result = backend.run_inference(
+                prompt=prompt,
+                model_id=self.config.model,
+                max_tokens=self.config.max_tokens,
+            )
+            latency_ms = (time.perf_counter() - start) * 1000
+            if result.get("error"):
+                raise RuntimeError(result["error"])
+            return latency_ms, result.get("tokens_generated", 0)
+
         if self.config.verbose:
-            print("\nbitnet.cpp integration not yet available")
+            print(f"\nRunning {iterations} bitnet.cpp iterations...")
 
-        return None
+        sampler = RAMSampler()
+        sampler.start()
+        start_time = time.perf_counter()
+        total_tokens = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.config.workers)) as pool:
+                for k, (latency_ms, tokens) in enumerate(pool.map(run_one, prompts)):
+                    latencies_ms[k] = latency_ms
+                    tokens_per_request[k] = tokens
+                    total_tokens += tokens
+        except RuntimeError as e:
+            print(f"\nbitnet.cpp benchmark failed: {e}")
+            return None
+        finally:
+            sampler.stop()
+        end_time = time.perf_counter()
+
+        return self._build_results(
+            end_time - start_time, total_tokens, latencies_ms,
+            tokens_per_request, sampler.samples_mb, _samples("d", 0))
 
     def run(self) -> Dict[str, Any]:
         """Run complete benchmark suite."""
         self.setup()
         self.warmup()
 
-        env = get_environment_info()
+        env = self._env
         git_commit = get_git_commit()
 
         # Run simulation benchmark
@@ -381,9 +862,11 @@ class ARIABenchmark:
         print(f"Model: {self.config.model}")
         print(f"Iterations: {self.config.iterations}")
         print(f"Max Tokens: {self.config.max_tokens}")
+        print(f"Batch Size: {self.config.batch_size}")
         print(f"Seed: {self.config.seed}")
 
         sim_results = self.run_simulation_benchmark()
+        self.results = {"simulation": sim_results}
 
         # Print results
         print("\n" + "-" * 60)
@@ -406,6 +889,7 @@ class ARIABenchmark:
         if self.config.compare_bitnet:
             bitnet_results = self.run_bitnet_benchmark()
             if bitnet_results:
+                self.results["bitnet"] = bitnet_results
                 print()
                 print("-" * 60)
                 print("Comparison: Simulation vs bitnet.cpp")
@@ -422,6 +906,7 @@ class ARIABenchmark:
                 "timestamp": datetime.utcnow().isoformat() + "Z",
                 "git_commit": git_commit,
                 "seed": self.config.seed,
+                "warmup_iterations_actual": self.warmup_iterations_actual,
             },
             "environment": asdict(env),
             "config": {
@@ -429,7 +914,11 @@ class ARIABenchmark:
                 "iterations": self.config.iterations,
                 "max_tokens": self.config.max_tokens,
                 "warmup": self.config.warmup,
-                "tdp_watts": self.config.tdp_watts or estimate_tdp(env.cpu),
+                "batch_size": self.config.batch_size,
+                "autotune_batch": self.config.autotune_batch,
+                "workers": self.config.workers,
+                "async_pipeline": self.config.async_pipeline,
+                "tdp_watts": self._tdp,
             },
             "results": {
                 "simulation": {
@@ -445,14 +934,13 @@ class ARIABenchmark:
                 },
             },
             "raw_data": {
-                "simulation": {
-                    "latencies_ms": sim_results.latencies_ms,
-                    "tokens_per_request": sim_results.tokens_per_request,
-                    "ram_samples_mb": sim_results.ram_samples_mb,
-                }
+                "simulation": sim_results.raw_data(),
             },
         }
 
+        if self.warmup_autotune:
+            report["warmup_autotune"] = self.warmup_autotune
+
         if bitnet_results:
             report["results"]["bitnet"] = {
                 "throughput_tokens_per_sec": bitnet_results.throughput_tokens_per_sec,
@@ -464,10 +952,14 @@ class ARIABenchmark:
                 "avg_ram_mb": bitnet_results.avg_ram_mb,
             }
             report["raw_data"]["bitnet"] = {
-                "latencies_ms": bitnet_results.latencies_ms,
-                "tokens_per_request": bitnet_results.tokens_per_request,
+                "latencies_ms": bitnet_results.latencies_ms.tolist(),
+                "tokens_per_request": bitnet_results.tokens_per_request.tolist(),
             }
 
+        # Raw samples go to a sidecar written by the caller (see write_raw_samples)
+        if self.config.raw_file:
+            del report["raw_data"]
+
         return report
 
 
@@ -480,6 +972,7 @@ def main():
 Examples:
   python run_benchmark.py
   python run_benchmark.py --iterations 100 --max-tokens 256
+  python run_benchmark.py --batch-size 8
   python run_benchmark.py --seed 123 --output results/my_benchmark.json
   python run_benchmark.py --compare-bitnet --verbose
         """
@@ -519,7 +1012,34 @@ Examples:
         "--warmup", "-w",
         type=int,
         default=5,
-        help="Warmup iterations (default: 5)"
+        help="Minimum warmup iterations; warmup continues until latency "
+             "stabilizes (default: 5)"
+    )
+    parser.add_argument(
+        "--batch-size", "-b",
+        type=int,
+        default=1,
+        help="Prompts dispatched to the engine per batch (default: 1)"
+    )
+    parser.add_argument(
+        "--autotune-batch",
+        action="store_true",
+        help="Pick the batch size with the best warmup throughput "
+             "(overrides --batch-size)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Requests run in parallel: worker processes for the simulation "
+             "engine, threads driving llama-cli for --compare-bitnet; 1 keeps "
+             "the serial baseline (default: 1)"
+    )
+    parser.add_argument(
+        "--async",
+        dest="async_pipeline",
+        action="store_true",
+        help="Overlap batch preparation with inference via an asyncio queue"
     )
     parser.add_argument(
         "--prompts",
@@ -538,6 +1058,16 @@ Examples:
         action="store_true",
         help="Compare with bitnet.cpp if available"
     )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip the JSON report (writes <output>.gz)"
+    )
+    parser.add_argument(
+        "--raw-file",
+        action="store_true",
+        help="Write raw samples to <output stem>.raw.jsonl instead of the report"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -563,8 +1093,13 @@ Examples:
         seed=args.seed,
         model=args.model,
         warmup=args.warmup,
+        batch_size=args.batch_size,
+        autotune_batch=args.autotune_batch,
+        workers=args.workers,
+        async_pipeline=args.async_pipeline,
         tdp_watts=args.tdp,
         compare_bitnet=args.compare_bitnet,
+        raw_file=args.raw_file,
         verbose=args.verbose,
         prompts=prompts,
     )
@@ -584,8 +1119,15 @@ Examples:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Write results
-    with open(output_path, "w") as f:
-        json.dump(report, f, indent=2)
+    if args.raw_file:
+        raw_path = write_raw_samples(
+            benchmark.results,
+            output_path.with_name(output_path.stem + ".raw.jsonl"),
+            compress=args.gzip,
+        )
+        report["raw_file"] = raw_path.name
+        print(f"Raw samples saved to: {raw_path}")
+    output_path = write_report(report, output_path, compress=args.gzip)
 
     print()
     print("=" * 60)
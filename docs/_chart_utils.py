@@ -0,0 +1,128 @@
+"""
+Shared chart helpers for the docs PDF generators.
+
+Imported by generate_report.py and generate_whitepaper_v2.py so the
+Agg backend, palette, the draw-once save path and the PDF rebuild
+check live in one place.
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import functools
+import hashlib
+import inspect
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import reportlab
+from PIL import Image as PILImage
+
+# ============================
+# Color scheme
+# ============================
+PRIMARY = '#2E86AB'
+SECONDARY = '#4ECDC4'
+ACCENT = '#A23B72'
+DARK = '#1a1a2e'
+TEXT = '#333333'
+LIGHT_BG = '#e8f4f8'
+
+# Bump to force every cached chart to be redrawn
+CHART_CACHE_VERSION = 1
+# Charts are embedded 12-14 cm wide; 100 dpi is already above print scale there
+CHART_DPI = 100
+
+def cached_png(func):
+    """Skip redrawing a chart whose code and inputs are unchanged.
+
+    The key hashes the function source, the shared finalize_chart() and
+    save_chart() helpers, its arguments (except filename) and the
+    matplotlib version; hits are copied from the .cache directory next
+    to filename.
+    """
+    signature = inspect.signature(func)
+    source = inspect.getsource(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        filename = bound.arguments.pop('filename')
+        helpers = inspect.getsource(finalize_chart) + inspect.getsource(save_chart)
+        key = repr((CHART_CACHE_VERSION, matplotlib.__version__, source, helpers,
+                    sorted(bound.arguments.items())))
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        ext = os.path.splitext(filename)[1]
+        cache_dir = os.path.join(os.path.dirname(filename), '.cache')
+        cached = os.path.join(cache_dir, digest + ext)
+        if not os.path.exists(cached):
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = os.path.join(cache_dir, f'{digest}.{os.getpid()}.tmp{ext}')
+            bound.arguments['filename'] = tmp
+            func(*bound.args, **bound.kwargs)
+            os.replace(tmp, cached)
+        shutil.copyfile(cached, filename)
+    return wrapper
+
+def save_chart(fig, filename, dpi=CHART_DPI):
+    """Write the figure's Agg buffer straight to disk with Pillow.
+
+    Unlike savefig(bbox_inches='tight') this draws the figure once;
+    each chart sets fixed margins with subplots_adjust() instead of
+    measuring text with tight_layout(). The PNG is quantized to a
+    256-colour palette, which flat chart art survives; it deflates far
+    smaller inside the PDF than RGBA or JPEG and skips ReportLab's
+    alpha-channel split.
+    """
+    fig.set_dpi(dpi)
+    fig.patch.set_facecolor('white')
+    fig.canvas.draw()
+    width, height = fig.canvas.get_width_height()
+    image = PILImage.frombuffer('RGBA', (width, height), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+    image = image.convert('RGB').quantize(256, method=PILImage.Quantize.FASTOCTREE)
+    image.save(filename, format='PNG', compress_level=1)
+
+def finalize_chart(fig, ax, filename, margins, grid=None):
+    """Apply the shared chart styling, save the figure and close it.
+
+    margins is (left, right, top, bottom) for subplots_adjust(); grid
+    is None, 'y' or 'both'.
+    """
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    if grid:
+        ax.grid(axis=grid, alpha=0.3)
+    left, right, top, bottom = margins
+    fig.subplots_adjust(left=left, right=right, top=top, bottom=bottom)
+    save_chart(fig, filename)
+    plt.close(fig)
+
+def ensure_chart_dir(base):
+    """Return base/charts, creating it if needed."""
+    chart_dir = os.path.join(base, "charts")
+    os.makedirs(chart_dir, exist_ok=True)
+    return chart_dir
+
+def _render_chart(func, filename):
+    func(filename)
+
+def render_charts(tasks):
+    """Render independent (chart function, filename) pairs, in parallel when possible."""
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        for func, filename in tasks:
+            _render_chart(func, filename)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # list() re-raises any worker exception here
+        list(executor.map(_render_chart, *zip(*tasks)))
+
+def pdf_digest(script_path, chart_paths):
+    """Hash everything a PDF is built from: its script, the charts and ReportLab."""
+    h = hashlib.sha1(reportlab.Version.encode())
+    for path in [script_path] + list(chart_paths):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
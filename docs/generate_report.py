@@ -3,10 +3,10 @@
 ARIA Protocol - Professional Benchmark Report Generator
 """
 
-import matplotlib
-matplotlib.use('Agg')
+from _chart_utils import cached_png, ensure_chart_dir, finalize_chart, pdf_digest, render_charts
 import matplotlib.pyplot as plt
 import numpy as np
+import json
 import os
 
 from reportlab.lib import colors
@@ -23,6 +23,7 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)))
 os.makedirs(output_dir, exist_ok=True)
 
+@cached_png
 def create_bar_chart_image(data, labels, title, ylabel, filename, colors_list=None):
     fig, ax = plt.subplots(figsize=(10, 5))
     if colors_list is None:
@@ -32,17 +33,11 @@ def create_bar_chart_image(data, labels, title, ylabel, filename, colors_list=No
     ax.set_xticks(x)
     ax.set_xticklabels(labels, rotation=0)
     ax.set_ylabel(ylabel)
-    for bar, val in zip(bars, data):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + max(data)*0.02,
-               f'{val:.2f}', ha='center', va='bottom', fontsize=9, fontweight='bold')
+    ax.bar_label(bars, labels=[f'{val:.2f}' for val in data], padding=3, fontsize=9, fontweight='bold')
     ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    finalize_chart(fig, ax, filename, (0.07, 0.98, 0.9, 0.08), grid='y')
 
+@cached_png
 def create_multiarch_chart(filename):
     """Create grouped bar chart comparing AMD and Intel throughput."""
     fig, ax = plt.subplots(figsize=(12, 6))
@@ -60,22 +55,14 @@ def create_multiarch_chart(filename):
     ax.set_ylabel('Tokens/second', fontsize=11)
     ax.set_title('Multi-Architecture Throughput Comparison', fontsize=14, fontweight='bold', pad=15)
     ax.legend(loc='upper right', fontsize=9)
-    for bar, val in zip(bars_amd, amd_data):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 2,
-               f'{val:.1f}', ha='center', va='bottom', fontsize=9, fontweight='bold', color='#4ECDC4')
-    for bar, val in zip(bars_intel, intel_data):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 2,
-               f'{val:.1f}', ha='center', va='bottom', fontsize=9, fontweight='bold', color='#2E86AB')
+    ax.bar_label(bars_amd, fmt='%.1f', padding=3, fontsize=9, fontweight='bold', color='#4ECDC4')
+    ax.bar_label(bars_intel, fmt='%.1f', padding=3, fontsize=9, fontweight='bold', color='#2E86AB')
     ax.annotate('Intel wins\n(+111%)', xy=(1 + width/2, 77.21), xytext=(1.8, 85),
                arrowprops=dict(arrowstyle='->', color='#FF6B6B', lw=2),
                fontsize=10, color='#FF6B6B', fontweight='bold', ha='center')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    finalize_chart(fig, ax, filename, (0.06, 0.98, 0.91, 0.07), grid='y')
 
+@cached_png
 def create_comparison_chart(filename):
     fig, ax = plt.subplots(figsize=(10, 6))
     providers = ['GPT-4o', 'Claude 3.5', 'GPT-4o-mini', 'Claude Haiku', 'Llama API', 'ARIA 0.7B', 'ARIA 2.4B', 'ARIA 8.0B']
@@ -86,15 +73,11 @@ def create_comparison_chart(filename):
     ax.set_title('Inference Cost Comparison', fontsize=14, fontweight='bold', pad=15)
     ax.invert_yaxis()
     ax.set_xscale('log')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    for bar, cost in zip(bars, costs):
-        label = f'${cost:.3f}' if cost < 0.1 else f'${cost:.2f}'
-        ax.text(cost * 1.5, bar.get_y() + bar.get_height()/2, label, va='center', fontsize=9, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    labels = [f'${cost:.3f}' if cost < 0.1 else f'${cost:.2f}' for cost in costs]
+    ax.bar_label(bars, labels=labels, padding=6, fontsize=9, fontweight='bold')
+    finalize_chart(fig, ax, filename, (0.12, 0.96, 0.91, 0.11))
 
+@cached_png
 def create_energy_chart(filename):
     fig, ax = plt.subplots(figsize=(10, 5))
     platforms = ['ARIA 0.7B', 'ARIA 2.4B', 'ARIA 8.0B', 'RTX 4090', 'A100', 'Cloud API']
@@ -104,15 +87,10 @@ def create_energy_chart(filename):
     ax.set_ylabel('Energy per Token (mJ)', fontsize=11)
     ax.set_title('Energy Consumption Comparison', fontsize=14, fontweight='bold', pad=15)
     ax.set_yscale('log')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    for bar, val in zip(bars, energy):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() * 1.3,
-               f'{val:,} mJ', ha='center', va='bottom', fontsize=9, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    ax.bar_label(bars, labels=[f'{val:,} mJ' for val in energy], padding=3, fontsize=9, fontweight='bold')
+    finalize_chart(fig, ax, filename, (0.07, 0.98, 0.9, 0.08))
 
+@cached_png
 def create_thread_scaling_chart(filename):
     fig, ax = plt.subplots(figsize=(8, 5))
     threads = [4, 8, 12, 24]
@@ -127,13 +105,9 @@ def create_thread_scaling_chart(filename):
     ax.set_title('Thread Scaling Performance (2.4B Model)', fontsize=14, fontweight='bold', pad=15)
     ax.set_xticks(threads)
     ax.set_ylim(30, 40)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    finalize_chart(fig, ax, filename, (0.08, 0.98, 0.9, 0.12), grid='both')
 
+@cached_png
 def create_positioning_chart(filename):
     fig, ax = plt.subplots(figsize=(9, 7))
     solutions = [
@@ -145,8 +119,9 @@ def create_positioning_chart(filename):
         (10, 0.008, 500, 'ARIA 2.4B', '#45B7AA'),
         (10, 0.018, 600, 'ARIA 8.0B', '#3CA99D'),
     ]
-    for privacy, cost, size, label, color in solutions:
-        ax.scatter(privacy, cost, s=size, c=color, alpha=0.7, edgecolors='black', linewidths=1)
+    privacies, costs, sizes, _, point_colors = zip(*solutions)
+    ax.scatter(privacies, costs, s=sizes, c=point_colors, alpha=0.7, edgecolors='black', linewidths=1)
+    for privacy, cost, _, label, _ in solutions:
         offset_y = cost * 0.3 if cost > 1 else 0.1
         ax.annotate(label, xy=(privacy, cost), xytext=(privacy, cost + offset_y),
                    ha='center', fontsize=9, fontweight='bold')
@@ -155,29 +130,124 @@ def create_positioning_chart(filename):
     ax.set_title('ARIA Market Positioning', fontsize=14, fontweight='bold', pad=15)
     ax.set_yscale('log')
     ax.set_xlim(0, 11)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.grid(alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    finalize_chart(fig, ax, filename, (0.09, 0.98, 0.92, 0.09), grid='both')
 
-def create_pdf_report():
-    print("Generating charts...")
-    chart_dir = os.path.join(output_dir, "charts")
-    os.makedirs(chart_dir, exist_ok=True)
-    
-    create_multiarch_chart(os.path.join(chart_dir, 'throughput.png'))
-    create_comparison_chart(os.path.join(chart_dir, 'cost.png'))
-    create_energy_chart(os.path.join(chart_dir, 'energy.png'))
-    create_thread_scaling_chart(os.path.join(chart_dir, 'threads.png'))
-    create_positioning_chart(os.path.join(chart_dir, 'positioning.png'))
-    
-    print("Building PDF...")
-    pdf_path = os.path.join(output_dir, "ARIA_Benchmark_Report.pdf")
-    doc = SimpleDocTemplate(pdf_path, pagesize=A4,
-        rightMargin=1.5*cm, leftMargin=1.5*cm, topMargin=2*cm, bottomMargin=2*cm)
-    
+# Report tables: row data and styles are built once at import
+METRICS_DATA = (('120.25 t/s', '~11 mJ', '99%', '$0.003'),
+                ('Peak Throughput', 'Energy/Token', 'Energy Savings', 'Cost/1M Tokens'))
+METRICS_STYLE = TableStyle([
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 18),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor('#2E86AB')),
+    ('FONTSIZE', (0,1), (-1,1), 9),
+    ('TEXTCOLOR', (0,1), (-1,1), colors.HexColor('#666666')),
+])
+
+SUMMARY_DATA = (
+    ('Metric', 'ARIA (Best)', 'ARIA (Balanced)', 'Industry Standard'),
+    ('Throughput', '120.25 t/s', '77.21 t/s', '50-100 t/s (GPU)'),
+    ('Energy/Token', '~11 mJ', '~28 mJ', '~3,000-7,000 mJ'),
+    ('Hardware Cost', '$0 (existing)', '$0 (existing)', '$1,000-$10,000+'),
+    ('Latency (TTFT)', '88 ms', '504 ms', '200-800 ms (API)'),
+    ('Privacy', '100% local', '100% local', 'Data sent to cloud'),
+)
+SUMMARY_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#2E86AB')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
+    ('BACKGROUND', (1,1), (2,-1), colors.HexColor('#e8f8f5')),
+    ('TOPPADDING', (0,0), (-1,-1), 8),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+])
+
+PERF_DATA = (
+    ('Model', 'AMD t/s', 'AMD Latency', 'Intel t/s', 'Intel Latency', 'RAM'),
+    ('0.7B', '120.25', '588 ms', '61.81', '1,248 ms', '~400 MB'),
+    ('2.4B', '36.62', '2,120 ms', '77.21', '657 ms', '~1,300 MB'),
+    ('8.0B', '~15.03', '--', '10.36', '7,874 ms', '~4,200 MB'),
+)
+PERF_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4ECDC4')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
+    ('BACKGROUND', (1,1), (1,1), colors.HexColor('#d4edda')),
+    ('TOPPADDING', (0,0), (-1,-1), 6),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+])
+
+COST_DATA = (
+    ('Provider', 'Model', 'Cost/1M Tokens', 'Privacy', 'Latency'),
+    ('OpenAI', 'GPT-4o', '$15.00', 'Cloud', '200-500ms'),
+    ('Anthropic', 'Claude 3.5 Sonnet', '$15.00', 'Cloud', '200-600ms'),
+    ('Together.ai', 'Llama 3.1 70B', '$0.90', 'Cloud', '300-800ms'),
+    ('ARIA', '0.7B (local)', '$0.003', 'Local', '88ms'),
+    ('ARIA', '2.4B (local)', '$0.008', 'Local', '504ms'),
+    ('ARIA', '8.0B (local)', '$0.018', 'Local', '1,031ms'),
+)
+COST_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#2E86AB')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 8),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
+    ('BACKGROUND', (0,4), (-1,6), colors.HexColor('#e8f8f5')),
+    ('TOPPADDING', (0,0), (-1,-1), 5),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 5),
+])
+
+TCO_DATA = (
+    ('Solution', 'Hardware', 'API/Electricity', '3-Year Total', 'vs ARIA'),
+    ('GPT-4o', '$0', '$164,250', '$164,250', '2,161x'),
+    ('Claude 3.5 Sonnet', '$0', '$164,250', '$164,250', '2,161x'),
+    ('Llama API', '$0', '$32,850', '$32,850', '432x'),
+    ('RTX 4090 (local)', '$2,000', '$6,533', '$8,533', '112x'),
+    ('ARIA (existing CPU)', '$0', '$76', '$76', '1x'),
+)
+TCO_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#A23B72')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('ALIGN', (0,1), (0,-1), 'LEFT'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
+    ('BACKGROUND', (0,5), (-1,5), colors.HexColor('#d4edda')),
+    ('FONTNAME', (0,5), (-1,5), 'Helvetica-Bold'),
+    ('TOPPADDING', (0,0), (-1,-1), 6),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+])
+
+CONCLUSIONS_DATA = (
+    ('Finding', 'Implication'),
+    ('1-bit inference is memory-bound', 'Optimize for cache, not compute'),
+    ('Optimal threads = 8', 'Do not over-parallelize'),
+    ('Parallel requests do not scale (+11% only)', 'Use P2P distribution instead'),
+    ('99%+ energy reduction', 'Massive sustainability impact'),
+    ('$0 hardware cost', 'Democratizes AI inference'),
+    ('Sub-linear model scaling', 'Larger models viable on CPU'),
+    ('ISA matters more than core count', 'Route by CPU architecture, not just speed'),
+)
+CONCLUSIONS_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#A23B72')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,-1), 9),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
+    ('TOPPADDING', (0,0), (-1,-1), 8),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+])
+
+def _build_styles():
+    """Sample stylesheet plus the report's paragraph styles; treat as read-only."""
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(name='MainTitle', parent=styles['Title'], fontSize=28,
         textColor=colors.HexColor('#1a1a2e'), spaceAfter=10, alignment=TA_CENTER))
@@ -192,6 +262,39 @@ def create_pdf_report():
     styles.add(ParagraphStyle(name='Highlight', parent=styles['Normal'], fontSize=11,
         textColor=colors.HexColor('#1a1a2e'), backColor=colors.HexColor('#e8f4f8'),
         borderPadding=10, spaceAfter=15, spaceBefore=10))
+    styles.add(ParagraphStyle(name='Footer', parent=styles['Normal'], fontSize=9,
+        textColor=colors.HexColor('#666666'), alignment=TA_CENTER, spaceBefore=30))
+    return styles
+
+_STYLES = _build_styles()
+
+def create_pdf_report():
+    print("Generating charts...")
+    chart_dir = ensure_chart_dir(output_dir)
+    
+    chart_tasks = [
+        (create_multiarch_chart, os.path.join(chart_dir, 'throughput.png')),
+        (create_comparison_chart, os.path.join(chart_dir, 'cost.png')),
+        (create_energy_chart, os.path.join(chart_dir, 'energy.png')),
+        (create_thread_scaling_chart, os.path.join(chart_dir, 'threads.png')),
+        (create_positioning_chart, os.path.join(chart_dir, 'positioning.png')),
+    ]
+    render_charts(chart_tasks)
+    
+    pdf_path = os.path.join(output_dir, "ARIA_Benchmark_Report.pdf")
+    manifest_path = pdf_path + ".manifest"
+    digest = pdf_digest(os.path.abspath(__file__), [path for _, path in chart_tasks])
+    if os.path.exists(pdf_path) and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f).get('digest') == digest:
+                print(f"PDF up to date, skipping: {pdf_path}")
+                return
+    
+    print("Building PDF...")
+    doc = SimpleDocTemplate(pdf_path, pagesize=A4,
+        rightMargin=1.5*cm, leftMargin=1.5*cm, topMargin=2*cm, bottomMargin=2*cm)
+    
+    styles = _STYLES
     
     story = []
     
@@ -203,17 +306,8 @@ def create_pdf_report():
     story.append(Paragraph("Comprehensive Performance Analysis<br/>& Industry Comparison", styles['Subtitle']))
     story.append(Spacer(1, 1*inch))
     
-    metrics_data = [['120.25 t/s', '~11 mJ', '99%', '$0.003'],
-                    ['Peak Throughput', 'Energy/Token', 'Energy Savings', 'Cost/1M Tokens']]
-    metrics_table = Table(metrics_data, colWidths=[3.5*cm]*4)
-    metrics_table.setStyle(TableStyle([
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 18),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor('#2E86AB')),
-        ('FONTSIZE', (0,1), (-1,1), 9),
-        ('TEXTCOLOR', (0,1), (-1,1), colors.HexColor('#666666')),
-    ]))
+    metrics_table = Table(METRICS_DATA, colWidths=[3.5*cm]*4)
+    metrics_table.setStyle(METRICS_STYLE)
     story.append(metrics_table)
     story.append(Spacer(1, 1.5*inch))
     story.append(Paragraph("February 2026", styles['Subtitle']))
@@ -228,26 +322,8 @@ def create_pdf_report():
         "on consumer hardware (AMD Ryzen 9 7845HX and Intel Core i7-11370H) with fully reproducible methodology.",
         styles['CustomBody']))
     
-    summary_data = [
-        ['Metric', 'ARIA (Best)', 'ARIA (Balanced)', 'Industry Standard'],
-        ['Throughput', '120.25 t/s', '77.21 t/s', '50-100 t/s (GPU)'],
-        ['Energy/Token', '~11 mJ', '~28 mJ', '~3,000-7,000 mJ'],
-        ['Hardware Cost', '$0 (existing)', '$0 (existing)', '$1,000-$10,000+'],
-        ['Latency (TTFT)', '88 ms', '504 ms', '200-800 ms (API)'],
-        ['Privacy', '100% local', '100% local', 'Data sent to cloud'],
-    ]
-    summary_table = Table(summary_data, colWidths=[3.5*cm, 3.5*cm, 3.5*cm, 4*cm])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#2E86AB')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
-        ('BACKGROUND', (1,1), (2,-1), colors.HexColor('#e8f8f5')),
-        ('TOPPADDING', (0,0), (-1,-1), 8),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-    ]))
+    summary_table = Table(SUMMARY_DATA, colWidths=[3.5*cm, 3.5*cm, 3.5*cm, 4*cm])
+    summary_table.setStyle(SUMMARY_STYLE)
     story.append(summary_table)
     story.append(Spacer(1, 0.3*inch))
     
@@ -269,24 +345,8 @@ def create_pdf_report():
     story.append(Image(os.path.join(chart_dir, 'throughput.png'), width=14*cm, height=7*cm))
     story.append(Spacer(1, 0.2*inch))
     
-    perf_data = [
-        ['Model', 'AMD t/s', 'AMD Latency', 'Intel t/s', 'Intel Latency', 'RAM'],
-        ['0.7B', '120.25', '588 ms', '61.81', '1,248 ms', '~400 MB'],
-        ['2.4B', '36.62', '2,120 ms', '77.21', '657 ms', '~1,300 MB'],
-        ['8.0B', '~15.03', '--', '10.36', '7,874 ms', '~4,200 MB'],
-    ]
-    perf_table = Table(perf_data, colWidths=[2*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2*cm])
-    perf_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#4ECDC4')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
-        ('BACKGROUND', (1,1), (1,1), colors.HexColor('#d4edda')),
-        ('TOPPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ]))
+    perf_table = Table(PERF_DATA, colWidths=[2*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2*cm])
+    perf_table.setStyle(PERF_STYLE)
     story.append(perf_table)
     story.append(Spacer(1, 0.2*inch))
     
@@ -304,27 +364,8 @@ def create_pdf_report():
     story.append(Paragraph("Inference Cost Comparison", styles['SubsectionHeader']))
     story.append(Image(os.path.join(chart_dir, 'cost.png'), width=14*cm, height=8*cm))
     
-    cost_data = [
-        ['Provider', 'Model', 'Cost/1M Tokens', 'Privacy', 'Latency'],
-        ['OpenAI', 'GPT-4o', '$15.00', 'Cloud', '200-500ms'],
-        ['Anthropic', 'Claude 3.5 Sonnet', '$15.00', 'Cloud', '200-600ms'],
-        ['Together.ai', 'Llama 3.1 70B', '$0.90', 'Cloud', '300-800ms'],
-        ['ARIA', '0.7B (local)', '$0.003', 'Local', '88ms'],
-        ['ARIA', '2.4B (local)', '$0.008', 'Local', '504ms'],
-        ['ARIA', '8.0B (local)', '$0.018', 'Local', '1,031ms'],
-    ]
-    cost_table = Table(cost_data, colWidths=[2.5*cm, 3.5*cm, 2.5*cm, 2*cm, 2.5*cm])
-    cost_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#2E86AB')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 8),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
-        ('BACKGROUND', (0,4), (-1,6), colors.HexColor('#e8f8f5')),
-        ('TOPPADDING', (0,0), (-1,-1), 5),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-    ]))
+    cost_table = Table(COST_DATA, colWidths=[2.5*cm, 3.5*cm, 2.5*cm, 2*cm, 2.5*cm])
+    cost_table.setStyle(COST_STYLE)
     story.append(cost_table)
     story.append(Spacer(1, 0.3*inch))
     
@@ -342,28 +383,8 @@ def create_pdf_report():
     story.append(Paragraph("Total Cost of Ownership (3-Year)", styles['SubsectionHeader']))
     story.append(Paragraph("Scenario: 10 million tokens/day inference workload over 3 years.", styles['CustomBody']))
     
-    tco_data = [
-        ['Solution', 'Hardware', 'API/Electricity', '3-Year Total', 'vs ARIA'],
-        ['GPT-4o', '$0', '$164,250', '$164,250', '2,161x'],
-        ['Claude 3.5 Sonnet', '$0', '$164,250', '$164,250', '2,161x'],
-        ['Llama API', '$0', '$32,850', '$32,850', '432x'],
-        ['RTX 4090 (local)', '$2,000', '$6,533', '$8,533', '112x'],
-        ['ARIA (existing CPU)', '$0', '$76', '$76', '1x'],
-    ]
-    tco_table = Table(tco_data, colWidths=[3.5*cm, 2.5*cm, 3*cm, 2.5*cm, 2*cm])
-    tco_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#A23B72')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('ALIGN', (0,1), (0,-1), 'LEFT'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
-        ('BACKGROUND', (0,5), (-1,5), colors.HexColor('#d4edda')),
-        ('FONTNAME', (0,5), (-1,5), 'Helvetica-Bold'),
-        ('TOPPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ]))
+    tco_table = Table(TCO_DATA, colWidths=[3.5*cm, 2.5*cm, 3*cm, 2.5*cm, 2*cm])
+    tco_table.setStyle(TCO_STYLE)
     story.append(tco_table)
     story.append(Spacer(1, 0.3*inch))
     
@@ -375,27 +396,8 @@ def create_pdf_report():
     story.append(Paragraph("Conclusions", styles['SectionHeader']))
     story.append(Paragraph("Key Findings Summary", styles['SubsectionHeader']))
     
-    conclusions_data = [
-        ['Finding', 'Implication'],
-        ['1-bit inference is memory-bound', 'Optimize for cache, not compute'],
-        ['Optimal threads = 8', 'Do not over-parallelize'],
-        ['Parallel requests do not scale (+11% only)', 'Use P2P distribution instead'],
-        ['99%+ energy reduction', 'Massive sustainability impact'],
-        ['$0 hardware cost', 'Democratizes AI inference'],
-        ['Sub-linear model scaling', 'Larger models viable on CPU'],
-        ['ISA matters more than core count', 'Route by CPU architecture, not just speed'],
-    ]
-    conclusions_table = Table(conclusions_data, colWidths=[6*cm, 7.5*cm])
-    conclusions_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#A23B72')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,-1), 9),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.HexColor('#cccccc')),
-        ('TOPPADDING', (0,0), (-1,-1), 8),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-    ]))
+    conclusions_table = Table(CONCLUSIONS_DATA, colWidths=[6*cm, 7.5*cm])
+    conclusions_table.setStyle(CONCLUSIONS_STYLE)
     story.append(conclusions_table)
     story.append(Spacer(1, 0.5*inch))
     
@@ -403,10 +405,11 @@ def create_pdf_report():
         "<b>Document Information</b><br/>"
         "Version: 1.0 | Date: February 2026 | Author: ARIA Protocol Team<br/>"
         "Repository: github.com/spmfrance-cloud/aria-protocol | License: MIT",
-        ParagraphStyle('Footer', parent=styles['Normal'], fontSize=9,
-            textColor=colors.HexColor('#666666'), alignment=TA_CENTER, spaceBefore=30)))
+        styles['Footer']))
     
     doc.build(story)
+    with open(manifest_path, 'w') as f:
+        json.dump({'digest': digest}, f)
     print(f"PDF generated: {pdf_path}")
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 """Tests for the ARIA consent module."""
 
+import time
+
 from aria.consent import ARIAConsent, TaskType
 
 
@@ -152,3 +154,36 @@ class TestARIAConsent:
         consent1 = ARIAConsent(cpu_percent=25)
         consent2 = ARIAConsent(cpu_percent=50)
         assert consent1.to_hash() != consent2.to_hash()
+
+    def test_compile_matches_request(self):
+        """Test the compiled predicate agrees with matches_request."""
+        consents = [
+            ARIAConsent(),
+            ARIAConsent(task_types=[TaskType.TEXT_GENERATION, TaskType.TRANSLATION]),
+            ARIAConsent(max_ram_mb=128, min_contribution_score=0.05),
+        ]
+        requests = [
+            {"ram_mb": 64, "task_type": task_type, "contribution_score": score}
+            for task_type in TaskType
+            for score in (0.0, 0.1)
+        ] + [{}, {"ram_mb": 1024}]
+
+        for consent in consents:
+            compiled = consent.compile()
+            for request in requests:
+                assert compiled(request) == consent.matches_request(request)
+
+    def test_compile_schedule(self):
+        """Test the compiled predicate honours schedule and days."""
+        consent = ARIAConsent(schedule="22:00-06:00", days=["mon"])
+        compiled = consent.compile()
+        request = {"task_type": TaskType.TEXT_GENERATION}
+
+        # 1970-01-05 was a Monday
+        monday_night = time.gmtime(4 * 86400 + 23 * 3600)
+        monday_noon = time.gmtime(4 * 86400 + 12 * 3600)
+        tuesday_night = time.gmtime(5 * 86400 + 23 * 3600)
+
+        assert compiled(request, monday_night) is True
+        assert compiled(request, monday_noon) is False
+        assert compiled(request, tuesday_night) is False
@@ -1,6 +1,15 @@
 """Tests for the ARIA inference module."""
 
-from aria.inference import ModelShard, InferenceResult, TernaryLayer, InferenceEngine
+import asyncio
+import base64
+import hashlib
+import struct
+
+import pytest
+from aria.inference import (
+    ModelShard, InferenceResult, TernaryLayer, InferenceEngine, InferenceBatcher,
+    PipelineState, serialize_activations, deserialize_activations,
+)
 
 
 class TestModelShard:
@@ -94,6 +103,32 @@ class TestInferenceResult:
         assert record.tokens_generated == 3
         assert "node1" in record.node_ids
 
+    def test_result_is_slotted(self):
+        """Test results carry no per-instance __dict__."""
+        result = InferenceResult(
+            request_id="req-123", output_tokens=[], output_text="",
+            latency_ms=0, energy_mj=0, nodes_used=[], model_id="m",
+            tokens_generated=0,
+        )
+        assert not hasattr(result, "__dict__")
+
+    def test_provenance_record_hashes(self):
+        """Test query and output are hashed with SHA-256."""
+        result = InferenceResult(
+            request_id="req-123",
+            output_tokens=[1],
+            output_text="Test output",
+            latency_ms=100,
+            energy_mj=50,
+            nodes_used=["node1"],
+            model_id="aria-2b-1bit",
+            tokens_generated=1
+        )
+
+        record = result.to_provenance_record("test query")
+        assert record.query_hash == hashlib.sha256(b"test query").hexdigest()
+        assert record.output_hash == hashlib.sha256(b"Test output").hexdigest()
+
 
 class TestTernaryLayer:
     """Tests for TernaryLayer class."""
@@ -258,3 +293,165 @@ class TestInferenceEngine:
             assert result is not None
 
         assert engine.total_inferences == 3
+
+    def test_infer_batch(self):
+        """Test that a batch returns one result per request, in order."""
+        engine = InferenceEngine(node_id="test-node")
+        engine.load_model(model_id="aria-2b-1bit", num_layers=4, hidden_dim=128)
+
+        results = engine.infer_batch([
+            ("Query 0", "aria-2b-1bit", 3),
+            ("Query 1", "aria-2b-1bit", 5),
+        ])
+
+        assert [r.tokens_generated for r in results] == [3, 5]
+        assert engine.total_inferences == 2
+
+
+class TestPipelineStage:
+    """Tests for processing a pipeline stage on the local shard."""
+
+    def make_engine(self):
+        engine = InferenceEngine(node_id="stage-node")
+        engine.load_model(model_id="m", num_layers=8, hidden_dim=16,
+                          shard_start=4, shard_end=7)
+        return engine
+
+    def make_state(self, current_layer):
+        return PipelineState(
+            request_id="r", model_id="m", query="q", max_tokens=4,
+            activations=[0.1] * 16, current_layer=current_layer, total_layers=12,
+        )
+
+    def test_processes_remaining_shard_layers(self):
+        """Test a stage runs only the layers from current_layer to shard end."""
+        engine = self.make_engine()
+        layers = engine.layers["m"]
+
+        new_state, result = engine.process_pipeline_stage(self.make_state(6))
+
+        expected = [0.1] * 16
+        for layer in layers[2:]:
+            expected = layer.forward(expected)
+        assert result is None
+        assert new_state.current_layer == 8
+        assert new_state.activations == expected
+        assert new_state.total_energy_mj == sum(layer.energy_estimate_mj() for layer in layers[2:])
+        assert new_state.nodes_used == ["stage-node"]
+
+    def test_rejects_earlier_layers(self):
+        """Test a state before our shard is refused."""
+        with pytest.raises(ValueError):
+            self.make_engine().process_pipeline_stage(self.make_state(2))
+
+    def test_reload_replaces_shard(self):
+        """Test reloading a model routes stages through the new shard."""
+        engine = self.make_engine()
+        engine.load_model(model_id="m", num_layers=8, hidden_dim=16)
+
+        assert engine.get_shard_info("m").layer_start == 0
+        new_state, _ = engine.process_pipeline_stage(self.make_state(0))
+        assert new_state.current_layer == 8
+
+
+class TestInferenceBatcher:
+    """Tests for InferenceBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_batch(self):
+        """Test that requests arriving together run as one batch."""
+        engine = InferenceEngine(node_id="test-node")
+        engine.load_model(model_id="aria-2b-1bit", num_layers=4, hidden_dim=128)
+        batcher = InferenceBatcher(engine.infer_batch, batch_size=8, max_delay=0.05)
+        batcher.start()
+
+        results = await asyncio.gather(*(
+            batcher.submit(f"Query {i}", "aria-2b-1bit", i + 1) for i in range(4)
+        ))
+        await batcher.stop()
+
+        assert [r.tokens_generated for r in results] == [1, 2, 3, 4]
+        assert batcher.batches_run == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self):
+        """Test that a full batch runs without waiting for the delay."""
+        engine = InferenceEngine(node_id="test-node")
+        engine.load_model(model_id="aria-2b-1bit", num_layers=4, hidden_dim=128)
+        batcher = InferenceBatcher(engine.infer_batch, batch_size=2, max_delay=10.0)
+        batcher.start()
+
+        results = await asyncio.wait_for(asyncio.gather(*(
+            batcher.submit(f"Query {i}", "aria-2b-1bit", 2) for i in range(4)
+        )), timeout=5.0)
+        await batcher.stop()
+
+        assert len(results) == 4
+        assert batcher.batches_run == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test that a failing batch fails each waiting request."""
+        def failing_batch(requests):
+            raise ValueError("boom")
+
+        batcher = InferenceBatcher(failing_batch)
+        batcher.start()
+
+        results = await asyncio.gather(
+            batcher.submit("a", "m", 1), batcher.submit("b", "m", 1),
+            return_exceptions=True,
+        )
+        await batcher.stop()
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_stop_during_delay_cancels_collected_requests(self):
+        """Test that stopping while a batch is still filling cancels its callers."""
+        batcher = InferenceBatcher(lambda requests: [], batch_size=8, max_delay=10.0)
+        batcher.start()
+
+        pending = [asyncio.create_task(batcher.submit(q, "m", 1)) for q in "ab"]
+        # Let the worker take both requests off the queue and start waiting
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*pending, return_exceptions=True), timeout=1.0)
+        assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_submit_requires_start(self):
+        """Test that submitting to a stopped batcher raises."""
+        batcher = InferenceBatcher(lambda requests: [])
+        with pytest.raises(RuntimeError):
+            await batcher.submit("a", "m", 1)
+
+
+class TestActivationSerialization:
+    """Tests for pipeline activation encoding."""
+
+    def test_round_trip(self):
+        """Test activations survive encoding at float32 precision."""
+        activations = [0.5, -1.25, 3.0, 0.0]
+        assert deserialize_activations(serialize_activations(activations)) == activations
+
+    def test_wire_format_is_base64_packed_floats(self):
+        """Test the encoding stays compatible with struct + base64 peers."""
+        activations = [0.1 * i for i in range(16)]
+        legacy = base64.b64encode(struct.pack("16f", *activations)).decode("ascii")
+
+        assert serialize_activations(activations) == legacy
+        assert deserialize_activations(legacy) == list(struct.unpack("16f", base64.b64decode(legacy)))
+
+    def test_pipeline_state_round_trip(self):
+        """Test PipelineState survives to_dict/from_dict."""
+        state = PipelineState(
+            request_id="r", model_id="m", query="q", max_tokens=4,
+            activations=[1.0, 2.0], current_layer=3, total_layers=8,
+        )
+        restored = PipelineState.from_dict(state.to_dict())
+
+        assert restored.activations == [1.0, 2.0]
+        assert restored.current_layer == 3
@@ -147,6 +147,31 @@ class TestProvenanceLedger:
         assert len(ledger.pending_records) == 1
         assert record_hash == record.to_hash()
 
+    def test_add_records_seals_full_blocks(self):
+        """Test a bulk add seals every block it completes."""
+        ledger = ProvenanceLedger(difficulty=1)
+        records = [
+            InferenceRecord(
+                query_hash=f"q{i}",
+                output_hash=f"o{i}",
+                model_id="aria-2b-1bit",
+                node_ids=["node1"],
+                energy_mj=50,
+                latency_ms=100,
+                timestamp=time.time(),
+                tokens_generated=10
+            )
+            for i in range(25)
+        ]
+
+        record_hashes = ledger.add_records(records)
+
+        assert record_hashes == [r.to_hash() for r in records]
+        assert len(ledger.chain) == 3
+        assert ledger.pending_records == records[20:]
+        assert [r.query_hash for r in ledger.chain[2].records] == [f"q{i}" for i in range(10, 20)]
+        assert ledger.verify_chain()
+
     def test_seal_pending_block(self):
         """Test sealing a block with pending records."""
         ledger = ProvenanceLedger(difficulty=1)
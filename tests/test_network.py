@@ -0,0 +1,704 @@
+"""Tests for the ARIA network module."""
+
+import asyncio
+import json
+import sys
+import time
+
+import pytest
+
+from aria.consent import ARIAConsent, TaskType
+from aria.network import ARIANetwork, InferenceRequest, PeerInfo, install_uvloop
+
+
+def make_peer(node_id: str, **kwargs) -> PeerInfo:
+    """Create a consenting peer for routing tests."""
+    kwargs.setdefault("consent", ARIAConsent())
+    return PeerInfo(node_id=node_id, host="localhost", port=8765, **kwargs)
+
+
+class TestPeerInfo:
+    """Tests for PeerInfo routing metrics."""
+
+    def test_record_latency_first_sample(self):
+        """Test the first latency sample seeds the moving average."""
+        peer = make_peer("p1")
+        peer.record_latency(400)
+        assert peer.avg_latency_ms == 400
+
+    def test_record_latency_ewma(self):
+        """Test later samples are blended with the EWMA weight."""
+        peer = make_peer("p1", avg_latency_ms=1000, total_inferences=5)
+        peer.record_latency(2000)
+        assert peer.avg_latency_ms == 0.2 * 2000 + 0.8 * 1000
+
+    def test_record_success(self):
+        """Test a success counts the inference and keeps reputation bounded."""
+        peer = make_peer("p1")
+        peer.record_success(250)
+        assert peer.total_inferences == 1
+        assert peer.avg_latency_ms == 250
+        assert peer.current_reputation() == 1.0
+
+    def test_record_failure_lowers_reputation(self):
+        """Test a failure applies a reputation penalty."""
+        peer = make_peer("p1")
+        peer.record_failure()
+        assert abs(peer.current_reputation() - 0.9) < 1e-3
+
+    def test_reputation_penalty_decays(self):
+        """Test penalties fade back toward 1.0 over time."""
+        peer = make_peer("p1", reputation=0.5)
+        peer.reputation_updated = time.monotonic() - peer.REPUTATION_DECAY_TAU
+
+        decayed = peer.current_reputation()
+        assert 0.5 < decayed < 1.0
+        assert abs(decayed - (1.0 - 0.5 * 0.3679)) < 1e-3
+
+    def test_matches_request_follows_consent_changes(self):
+        """Test the cached consent predicate is rebuilt for a new consent."""
+        peer = make_peer("p1", consent=ARIAConsent(max_ram_mb=1024))
+        request = {"task_type": TaskType.TEXT_GENERATION, "ram_mb": 512}
+        assert peer.matches_request(request) is True
+
+        peer.consent = ARIAConsent(max_ram_mb=256)
+        assert peer.matches_request(request) is False
+
+        peer.consent = None
+        assert peer.matches_request(request) is False
+
+    def test_quality_score_uses_decayed_reputation(self):
+        """Test an old penalty weighs less than a fresh one."""
+        fresh = make_peer("fresh", reputation=0.2)
+        old = make_peer("old", reputation=0.2)
+        old.reputation_updated = time.monotonic() - 10 * old.REPUTATION_DECAY_TAU
+
+        assert old.quality_score() > fresh.quality_score()
+
+
+class TestPeerRouting:
+    """Tests for consent-based peer routing."""
+
+    def test_find_peers_sorted_by_quality(self):
+        """Test that matching peers are returned best first."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("slow", avg_latency_ms=4000))
+        network.add_peer(make_peer("fast", avg_latency_ms=100))
+        network.add_peer(make_peer("medium", avg_latency_ms=2000))
+
+        request = InferenceRequest(request_id="r1", query="hi", model_id="aria-2b-1bit")
+        peers = network.find_peers_for_request(request)
+
+        assert [p.node_id for p in peers] == ["fast", "medium", "slow"]
+
+    def test_find_peers_skips_peers_without_consent(self):
+        """Test that peers without a consent descriptor are never selected."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("with_consent"))
+        network.add_peer(make_peer("no_consent", consent=None))
+
+        request = InferenceRequest(request_id="r1", query="hi", model_id="aria-2b-1bit")
+        peers = network.find_peers_for_request(request)
+
+        assert [p.node_id for p in peers] == ["with_consent"]
+
+    def test_find_peers_with_limit(self):
+        """Test top-k selection matches the head of the full ranking."""
+        network = ARIANetwork(node_id="router")
+        for i in range(20):
+            network.add_peer(make_peer(f"peer_{i}", avg_latency_ms=(i * 37) % 5000))
+
+        request = InferenceRequest(request_id="r1", query="hi", model_id="aria-2b-1bit")
+        full = network.find_peers_for_request(request)
+        top = network.find_peers_for_request(request, limit=5)
+
+        assert len(top) == 5
+        assert [p.node_id for p in top] == [p.node_id for p in full[:5]]
+
+    def test_dead_peers_excluded(self):
+        """Test peers not seen for five minutes are not routed to."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("alive"))
+        network.add_peer(make_peer("stale"))
+        network.peers["stale"].last_seen = time.monotonic() - 301
+
+        alive = [p.node_id for p in network.get_alive_peers()]
+        assert alive == ["alive"]
+
+    def test_prune_dead_peers(self):
+        """Test pruning removes stale peers and their shard entries."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("alive"))
+        network.add_peer(make_peer("stale", available_shards=["m_L0-7"]))
+        network.peers["stale"].last_seen = time.monotonic() - 301
+
+        network.prune_dead_peers()
+
+        assert list(network.peers) == ["alive"]
+        assert "m_L0-7" not in network.shard_registry
+
+
+class TestEventLoop:
+    """Tests for event loop selection."""
+
+    def test_install_uvloop_unavailable(self, monkeypatch):
+        """Test install_uvloop is a no-op when uvloop is not installed."""
+        monkeypatch.setitem(sys.modules, "uvloop", None)
+        assert install_uvloop() is False
+
+
+class TestJsonCodec:
+    """Tests for message (de)serialization."""
+
+    @pytest.mark.asyncio
+    async def test_response_round_trip(self):
+        """Test responses with non-string keys encode like the stdlib."""
+        network = ARIANetwork(node_id="codec")
+
+        async def handler(sender_id, data):
+            return {"counts": {1: 2}, "value": 0.5}
+
+        network._handlers["stats"] = handler
+        raw = await network.handle_message(network.create_message("stats", {}))
+
+        assert json.loads(raw) == {"counts": {"1": 2}, "value": 0.5, "reply_to": 1}
+
+
+class TestBootstrap:
+    """Tests for seed peer bootstrapping."""
+
+    @pytest.mark.asyncio
+    async def test_seeds_connect_concurrently(self, monkeypatch):
+        """Test all seed handshakes are in flight at the same time."""
+        network = ARIANetwork(node_id="boot", port=9000)
+        in_flight = []
+        peak = []
+
+        async def fake_connect(host, port):
+            in_flight.append(port)
+            await asyncio.sleep(0.01)
+            peak.append(len(in_flight))
+            in_flight.remove(port)
+            return True
+
+        monkeypatch.setattr(network, "connect_to_peer", fake_connect)
+
+        await network.bootstrap(["a:9001", "b:9002", "bad", "self:9000", "c:9003"])
+
+        assert max(peak) == 3
+
+
+class TestRoutingTableBounds:
+    """Tests for the bounded routing table."""
+
+    def test_peers_capped(self, monkeypatch):
+        """Test the routing table never exceeds MAX_PEERS."""
+        monkeypatch.setattr(ARIANetwork, "MAX_PEERS", 3)
+        network = ARIANetwork(node_id="router")
+        for i in range(5):
+            network.add_peer(make_peer(f"peer_{i}"))
+
+        assert list(network.peers) == ["peer_2", "peer_3", "peer_4"]
+
+    def test_recently_seen_peer_survives_eviction(self, monkeypatch):
+        """Test eviction drops the least recently seen peer."""
+        monkeypatch.setattr(ARIANetwork, "MAX_PEERS", 3)
+        network = ARIANetwork(node_id="router")
+        for i in range(3):
+            network.add_peer(make_peer(f"peer_{i}"))
+
+        network._touch_peer("peer_0")
+        network.add_peer(make_peer("peer_3"))
+
+        assert "peer_0" in network.peers
+        assert "peer_1" not in network.peers
+
+    def test_self_never_evicted(self, monkeypatch):
+        """Test the local node's own entry is kept when the table is full."""
+        monkeypatch.setattr(ARIANetwork, "MAX_PEERS", 2)
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("router"))
+        network.add_peer(make_peer("peer_0"))
+        network.add_peer(make_peer("peer_1"))
+
+        assert list(network.peers) == ["router", "peer_1"]
+
+
+class FakeConnection:
+    """Minimal stand-in for a WebSocket connection."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message, text=None):
+        self.sent.append(message)
+
+    async def close(self):
+        pass
+
+
+class FailingConnection(FakeConnection):
+    """Connection whose sends raise until ``fail`` is cleared."""
+
+    def __init__(self):
+        super().__init__()
+        self.fail = True
+
+    async def send(self, message, text=None):
+        if self.fail:
+            raise ConnectionError("connection lost")
+        await super().send(message, text)
+
+
+class TestShardAnnouncements:
+    """Tests for shard announcement deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_shards_not_resent(self):
+        """Test repeating an announcement does not resend it."""
+        network = ARIANetwork(node_id="router")
+        conn = FakeConnection()
+        network._register_connection("peer_a", conn)
+
+        await network.announce_shards(["m_L0-7"])
+        await network.announce_shards(["m_L0-7"])
+
+        assert len(conn.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_one_encoded_payload(self):
+        """Test every peer receives the same pre-encoded buffer."""
+        network = ARIANetwork(node_id="router")
+        first, second = FakeConnection(), FakeConnection()
+        network._register_connection("peer_a", first)
+        network._register_connection("peer_b", second)
+
+        await network.broadcast(network.create_message("ping", {}))
+
+        assert isinstance(first.sent[0], bytes)
+        assert first.sent[0] is second.sent[0]
+        assert json.loads(first.sent[0])["type"] == "ping"
+
+    @pytest.mark.asyncio
+    async def test_changed_shards_resent(self):
+        """Test a new shard set is announced again."""
+        network = ARIANetwork(node_id="router")
+        conn = FakeConnection()
+        network._register_connection("peer_a", conn)
+
+        await network.announce_shards(["m_L0-7"])
+        await network.announce_shards(["m_L0-7", "m_L8-15"])
+
+        assert len(conn.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_new_peer_receives_existing_shards(self):
+        """Test peers connecting later still get the current announcement."""
+        network = ARIANetwork(node_id="router")
+        first, second = FakeConnection(), FakeConnection()
+        network._register_connection("peer_a", first)
+        await network.announce_shards(["m_L0-7"])
+
+        network._register_connection("peer_b", second)
+        await network.announce_shards(["m_L0-7"])
+
+        assert len(first.sent) == 1
+        assert len(second.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_send_is_retried(self):
+        """Test a peer whose send failed is announced to again."""
+        network = ARIANetwork(node_id="router")
+        conn = FailingConnection()
+        network._register_connection("peer_a", conn)
+
+        await network.announce_shards(["m_L0-7"])
+        assert "peer_a" not in network._shards_announced_to
+
+        conn.fail = False
+        await network.announce_shards(["m_L0-7"])
+        assert network._shards_announced_to == {"peer_a"}
+        assert len(conn.sent) == 1
+
+
+class TestMessageHandling:
+    """Tests for message envelope dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_ping_returns_pong(self):
+        """Test a ping is answered with a pong."""
+        network = ARIANetwork(node_id="router")
+        raw = network.create_message("ping", {})
+
+        response = json.loads(await network.handle_message(raw))
+
+        assert response["type"] == "pong"
+        assert response["node_id"] == "router"
+        assert network.messages_received == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_message_type(self):
+        """Test unknown message types are reported."""
+        network = ARIANetwork(node_id="router")
+        raw = network.create_message("no_such_type", {})
+
+        response = json.loads(await network.handle_message(raw))
+
+        assert "Unknown message type" in response["error"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_envelope(self):
+        """Test malformed JSON and non-object payloads are rejected."""
+        network = ARIANetwork(node_id="router")
+
+        for raw in ("not json", "[1, 2, 3]"):
+            response = json.loads(await network.handle_message(raw))
+            assert response == {"error": "Invalid JSON"}
+
+
+class TestShardRegistry:
+    """Tests for the shard registry and pipeline chain building."""
+
+    def test_registry_holds_sets(self):
+        """Test re-adding a peer does not duplicate registry entries."""
+        network = ARIANetwork(node_id="router")
+        peer = make_peer("a", available_shards=["m_L0-7"])
+        network.add_peer(peer)
+        network.add_peer(peer)
+
+        assert network.shard_registry["m_L0-7"] == {"a"}
+
+    def test_remove_peer_cleans_registry(self):
+        """Test removing the last holder drops the shard entry."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("a", available_shards=["m_L0-7"]))
+        network.add_peer(make_peer("b", available_shards=["m_L0-7", "m_L8-15"]))
+
+        network.remove_peer("b")
+
+        assert network.shard_registry == {"m_L0-7": {"a"}}
+        assert [p.node_id for p in network.find_shard_holders("m_L0-7")] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_shard_announce_replaces_shards(self):
+        """Test a peer is unregistered from shards it stops announcing."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("a", available_shards=["m_L0-7"]))
+
+        await network._handle_shard_announce("a", {"shard_ids": ["m_L8-15"]})
+
+        assert "m_L0-7" not in network.shard_registry
+        assert network.shard_registry["m_L8-15"] == {"a"}
+
+    def test_chain_primary_is_best_peer(self):
+        """Test the primary for a stage is the best scoring holder."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("slow", avg_latency_ms=4000, available_shards=["m_L0-7"]))
+        network.add_peer(make_peer("fast", avg_latency_ms=100, available_shards=["m_L0-7"]))
+        network.add_peer(make_peer("tail", available_shards=["m_L8-15"]))
+
+        chain = network.build_pipeline_chain("m", total_layers=16)
+
+        assert chain[0][0] == "fast"
+        assert chain[0][4] == ["slow"]
+        assert chain[1][0] == "tail"
+        assert network._is_chain_complete(chain)
+
+    def test_chain_prefers_local_shard(self):
+        """Test the local node is primary for shards it holds."""
+        network = ARIANetwork(node_id="router")
+        network.local_shards = ["m_L0-7"]
+        network.add_peer(make_peer("router", available_shards=["m_L0-7"]))
+        network.add_peer(make_peer("fast", avg_latency_ms=1, available_shards=["m_L0-7"]))
+
+        chain = network.build_pipeline_chain("m", total_layers=8)
+
+        assert chain[0][0] == "router"
+        assert chain[0][4] == ["fast"]
+
+    def test_chain_prefers_same_zone(self):
+        """Test same-zone holders come before better cross-zone ones."""
+        network = ARIANetwork(node_id="router", zone="rack-a")
+        network.add_peer(make_peer("far", avg_latency_ms=1, zone="rack-b",
+                                   available_shards=["m_L0-7"]))
+        network.add_peer(make_peer("near", avg_latency_ms=2000, zone="rack-a",
+                                   available_shards=["m_L0-7"]))
+
+        chain = network.build_pipeline_chain("m", total_layers=8)
+
+        assert chain[0][0] == "near"
+        assert chain[0][4] == ["far"]
+
+    def test_zone_defaults_to_env(self, monkeypatch):
+        """Test the zone comes from ARIA_ZONE and round-trips in PeerInfo."""
+        monkeypatch.setenv("ARIA_ZONE", "rack-c")
+        assert ARIANetwork(node_id="router").zone == "rack-c"
+
+        peer = PeerInfo.from_dict(make_peer("a", zone="rack-c").to_dict())
+        assert peer.zone == "rack-c"
+
+    def test_next_stage_is_cached(self, monkeypatch):
+        """Test repeated lookups for a layer reuse the cached stage."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("a", available_shards=["m_L0-7"]))
+        calls = []
+        build = network.build_pipeline_chain
+        monkeypatch.setattr(network, "build_pipeline_chain",
+                            lambda *args: calls.append(args) or build(*args))
+
+        first = network.get_next_stage("m", 3)
+        second = network.get_next_stage("m", 3)
+
+        assert first == second == ("a", "m_L0-7", 0, 7, [])
+        assert len(calls) == 1
+
+    def test_next_stage_cache_invalidated_on_topology_change(self):
+        """Test joins, leaves and failures drop cached stages."""
+        network = ARIANetwork(node_id="router")
+        network.add_peer(make_peer("slow", avg_latency_ms=4000, available_shards=["m_L0-7"]))
+        assert network.get_next_stage("m", 0)[0] == "slow"
+
+        network.add_peer(make_peer("fast", avg_latency_ms=100, available_shards=["m_L0-7"]))
+        assert network.get_next_stage("m", 0)[0] == "fast"
+
+        for _ in range(8):
+            network._record_peer_outcome("fast", None)
+        assert network.get_next_stage("m", 0)[0] == "slow"
+
+        network.remove_peer("slow")
+        assert network.get_next_stage("m", 0)[0] == "fast"
+
+    def test_next_stage_cache_expires(self):
+        """Test cached stages are recomputed after the TTL."""
+        network = ARIANetwork(node_id="router")
+        network.ROUTE_CACHE_TTL = 0.0
+        network.add_peer(make_peer("a", available_shards=["m_L0-7"]))
+        network.get_next_stage("m", 0)
+
+        network.peers["a"].last_seen -= PeerInfo.ALIVE_TIMEOUT + 1
+
+        assert network.get_next_stage("m", 0) is None
+
+
+class TestHashRouting:
+    """Tests for consistent-hash inference routing."""
+
+    def make_network(self, *node_ids):
+        network = ARIANetwork(node_id="router")
+        for nid in node_ids:
+            network.add_peer(make_peer(nid, available_shards=["m_L0-23"]))
+        return network
+
+    def test_same_prefix_same_peer(self):
+        """Test a query prefix always routes to the same holder."""
+        network = self.make_network("a", "b", "c")
+        prefix = "x" * network.ROUTING_PREFIX_CHARS
+
+        target = network.route_inference_request(prefix + " one", "m")
+        assert target in {"a", "b", "c"}
+        assert network.route_inference_request(prefix + " two", "m") == target
+
+    def test_only_holders_are_routed_to(self):
+        """Test peers without the model and ourselves are never chosen."""
+        network = self.make_network("a")
+        network.add_peer(make_peer("router", available_shards=["m_L0-23"]))
+        network.add_peer(make_peer("other", available_shards=["z_L0-23"]))
+
+        targets = {network.route_inference_request(f"q{i}", "m") for i in range(50)}
+
+        assert targets == {"a"}
+        assert network.route_inference_request("q", "missing") is None
+
+    def test_partial_shard_peer_not_routed_to(self):
+        """Test only peers holding every layer of the exact model are chosen."""
+        network = self.make_network("a")
+        network.add_peer(make_peer("partial", available_shards=["m_L0-5"]))
+        network.add_peer(make_peer("split", available_shards=["m_L0-11", "m_L12-23"]))
+        network.add_peer(make_peer("variant", available_shards=["m-v2_L0-23"]))
+
+        targets = {network.route_inference_request(f"q{i}", "m") for i in range(100)}
+
+        assert targets == {"a", "split"}
+
+    def test_non_consenting_peer_skipped(self):
+        """Test keys of a peer whose consent does not match go to the next one."""
+        network = self.make_network("a", "b")
+        network.peers["a"].consent = ARIAConsent(task_types=[TaskType.EMBEDDING])
+
+        assert {network.route_inference_request(f"q{i}", "m") for i in range(20)} == {"b"}
+
+    def test_leaving_peer_only_moves_its_keys(self):
+        """Test removing a peer keeps other keys on their peers."""
+        network = self.make_network("a", "b", "c", "d")
+        queries = [f"query {i}" for i in range(200)]
+        before = {q: network.route_inference_request(q, "m") for q in queries}
+
+        network.remove_peer("d")
+        after = {q: network.route_inference_request(q, "m") for q in queries}
+
+        assert len(set(before.values())) == 4
+        assert all(after[q] == before[q] for q in queries if before[q] != "d")
+        assert "d" not in after.values()
+
+    def test_dead_peer_skipped(self):
+        """Test keys of a timed-out peer go to the next alive one."""
+        network = self.make_network("a", "b")
+        network.peers["a"].last_seen -= PeerInfo.ALIVE_TIMEOUT + 1
+
+        assert {network.route_inference_request(f"q{i}", "m") for i in range(20)} == {"b"}
+
+
+class TestRequestRouting:
+    """Tests for reply routing over live connections."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_connection(self):
+        """Test concurrent requests to one peer each get their own reply."""
+        server = ARIANetwork(node_id="server", host="localhost", port=18931)
+        client = ARIANetwork(node_id="client", host="localhost", port=18932)
+        await server.start()
+        await client.start()
+        try:
+            assert await client.connect_to_peer("localhost", 18931)
+
+            messages = [client.create_message("ping", {}) for _ in range(5)]
+            replies = await asyncio.gather(
+                *(client.send_to_peer("server", m) for m in messages)
+            )
+
+            sent_ids = [json.loads(m)["msg_id"] for m in messages]
+            reply_ids = [json.loads(r)["reply_to"] for r in replies]
+            assert reply_ids == sent_ids
+            assert all(json.loads(r)["type"] == "pong" for r in replies)
+        finally:
+            await client.stop()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_requests_both_directions(self):
+        """Test the accepting side can issue requests on the same connection."""
+        server = ARIANetwork(node_id="server", host="localhost", port=18933)
+        client = ARIANetwork(node_id="client", host="localhost", port=18934)
+        await server.start()
+        await client.start()
+        try:
+            assert await client.connect_to_peer("localhost", 18933)
+            # The server learns the connection from the client's first request
+            assert await client.send_to_peer("server", client.create_message("ping", {}))
+
+            reply = await server.send_to_peer("client", server.create_message("ping", {}))
+
+            assert json.loads(reply)["node_id"] == "client"
+        finally:
+            await client.stop()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_request_returns_decoded_reply(self):
+        """Test request() builds the message and returns the reply dict."""
+        server = ARIANetwork(node_id="server", host="localhost", port=18935)
+        client = ARIANetwork(node_id="client", host="localhost", port=18936)
+        await server.start()
+        await client.start()
+        try:
+            assert await client.connect_to_peer("localhost", 18935)
+
+            reply = await client.request("server", "ping", {})
+
+            assert reply["type"] == "pong"
+            assert reply["node_id"] == "server"
+            assert "reply_to" not in reply
+            assert await client.request("nobody", "ping", {}) is None
+        finally:
+            await client.stop()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_keeps_peer_state(self):
+        """Test reconnecting after connection eviction keeps reputation and shards."""
+        server = ARIANetwork(node_id="server", host="localhost", port=18941)
+        client = ARIANetwork(node_id="client", host="localhost", port=18942)
+        await server.start()
+        await client.start()
+        try:
+            assert await client.connect_to_peer("localhost", 18941)
+            peer = client.peers["server"]
+            peer.available_shards = ["m_L0-23"]
+            client.shard_registry["m_L0-23"] = {"server"}
+            peer.record_failure()
+            peer.record_success(40.0)
+            reputation = peer.reputation
+
+            # Evicted by the connection limit, then reached again on demand
+            await client._connections.pop("server").close()
+            assert (await client.request("server", "ping", {}))["type"] == "pong"
+
+            assert client.peers["server"] is peer
+            assert peer.reputation == reputation
+            assert peer.avg_latency_ms == 40.0
+            assert peer.available_shards == ["m_L0-23"]
+            assert client.shard_registry["m_L0-23"] == {"server"}
+        finally:
+            await client.stop()
+            await server.stop()
+
+
+class TestPipelineBatching:
+    """Tests for coalescing pipeline forwards to the same node."""
+
+    async def run_forwards(self, server, client, count):
+        seen = []
+
+        async def pipeline(data):
+            seen.append(data["state"]["n"])
+            await asyncio.sleep(0.05)
+            return {"status": "completed", "result": {"n": data["state"]["n"]}}
+
+        server.set_pipeline_callback(pipeline)
+        await server.start()
+        await client.start()
+        assert await client.connect_to_peer("localhost", server.port)
+
+        responses = await asyncio.gather(*(
+            client.forward_pipeline_state("server", {"n": n}) for n in range(count)
+        ))
+        return [r["result"]["n"] for r in responses], seen
+
+    @pytest.mark.asyncio
+    async def test_concurrent_states_share_a_message(self):
+        """Test states queued behind an in-flight forward travel together."""
+        server = ARIANetwork(node_id="server", host="localhost", port=18937)
+        client = ARIANetwork(node_id="client", host="localhost", port=18938)
+        batches = []
+        handle_batch = server._handlers["pipeline_forward_batch"]
+
+        async def counting_batch(sender_id, data):
+            batches.append(len(data["items"]))
+            return await handle_batch(sender_id, data)
+
+        server._handlers["pipeline_forward_batch"] = counting_batch
+        try:
+            results, seen = await self.run_forwards(server, client, 4)
+        finally:
+            await client.stop()
+            await server.stop()
+
+        assert results == [0, 1, 2, 3]
+        assert sorted(seen) == [0, 1, 2, 3]
+        # The first state goes out alone, the rest wait and share one message
+        assert batches == [3]
+
+    @pytest.mark.asyncio
+    async def test_peer_without_batching(self):
+        """Test a peer that predates batching gets states one by one."""
+        server = ARIANetwork(node_id="server", host="localhost", port=18939)
+        client = ARIANetwork(node_id="client", host="localhost", port=18940)
+        del server._handlers["pipeline_forward_batch"]
+        try:
+            results, seen = await self.run_forwards(server, client, 3)
+        finally:
+            await client.stop()
+            await server.stop()
+
+        assert results == [0, 1, 2]
+        assert sorted(seen) == [0, 1, 2]
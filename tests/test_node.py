@@ -1,7 +1,9 @@
 """Tests for the ARIA node module."""
 
+import asyncio
+
 import pytest
-from aria.node import ARIANode
+from aria.node import ARIANode, contribution_score
 from aria.consent import ARIAConsent, TaskType
 
 
@@ -126,11 +128,12 @@ class TestARIANode:
         await node.start()
 
         initial_score = node.contribution_score
-        node.process_request(
+        result = node.process_request(
             query="Test query",
             model_id="aria-2b-1bit",
             max_tokens=5
         )
+        await node.wait_for_confirmation(result.request_id)
 
         assert node.contribution_score > initial_score
         await node.stop()
@@ -231,11 +234,12 @@ class TestARIANode:
         )
         await node.start()
 
-        node.process_request(
+        result = node.process_request(
             query="Test for ledger",
             model_id="aria-2b-1bit",
             max_tokens=5
         )
+        await node.wait_for_confirmation(result.request_id)
 
         # Check pending records in ledger
         assert len(node.ledger.pending_records) > 0
@@ -253,13 +257,148 @@ class TestARIANode:
         )
         await node.start()
 
-        node.process_request(
+        result = node.process_request(
             query="Test for pouw",
             model_id="aria-2b-1bit",
             max_tokens=5
         )
+        await node.wait_for_confirmation(result.request_id)
 
         # Check that proof was submitted
         assert node.pouw.verified_count > 0
 
         await node.stop()
+
+    @pytest.mark.asyncio
+    async def test_network_requests_are_batched(self):
+        """Test that concurrent network requests share one inference batch."""
+        node = ARIANode(node_id="batch-test", port=19009, batch_delay=0.05)
+        node.load_model(
+            model_id="aria-2b-1bit",
+            num_layers=4,
+            hidden_dim=128
+        )
+        await node.start()
+
+        responses = await asyncio.gather(*(
+            node._handle_network_inference({"query": f"Query {i}", "max_tokens": 5})
+            for i in range(3)
+        ))
+
+        for r in responses:
+            await node.wait_for_confirmation(r["request_id"])
+
+        assert node.batcher.batches_run == 1
+        assert all(r["node_id"] == "batch-test" for r in responses)
+        assert len(node.ledger.pending_records) == 3
+        assert node.pouw.verified_count == 3
+
+        await node.stop()
+
+    @pytest.mark.asyncio
+    async def test_proofs_recorded_off_response_path(self):
+        """Test ledger/proof recording is deferred to the proof worker."""
+        node = ARIANode(node_id="deferred-test", port=19010)
+        node.load_model(
+            model_id="aria-2b-1bit",
+            num_layers=4,
+            hidden_dim=128
+        )
+        await node.start()
+
+        result = node.process_request(query="Deferred", max_tokens=5)
+        assert node.pouw.verified_count == 0
+
+        await node.wait_for_confirmation(result.request_id)
+        assert node.pouw.verified_count == 1
+        assert len(node.ledger.pending_records) == 1
+
+        await node.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_proof_queue_records_inline(self):
+        """Test backpressure: a full queue records the request synchronously."""
+        node = ARIANode(node_id="backpressure-test", port=19011)
+        node.load_model(
+            model_id="aria-2b-1bit",
+            num_layers=4,
+            hidden_dim=128
+        )
+        await node.start()
+
+        for i in range(node.PROOF_QUEUE_SIZE + 2):
+            node.process_request(query=f"Query {i}", max_tokens=2)
+
+        # Two requests overflowed and were recorded without waiting
+        assert node.pouw.verified_count == 2
+
+        await node.stop()
+        assert node.pouw.verified_count == node.PROOF_QUEUE_SIZE + 2
+
+
+class TestRequestIds:
+    """Tests for outgoing inference request IDs."""
+
+    @pytest.mark.asyncio
+    async def test_request_ids_unique_per_node(self, monkeypatch):
+        """Test request IDs share a node prefix and never repeat."""
+        node = ARIANode(node_id="ids")
+        sent = []
+
+        async def fake_request(peer_id, msg_type, data, timeout=10.0):
+            sent.append(data["request_id"])
+            return {}
+
+        monkeypatch.setattr(node.network, "request", fake_request)
+        for _ in range(3):
+            await node.send_inference_request("peer", "q")
+
+        assert len(set(sent)) == 3
+        assert len({request_id[:12] for request_id in sent}) == 1
+        assert ARIANode(node_id="other")._request_prefix != node._request_prefix
+
+
+class TestStatsCache:
+    """Tests for get_stats caching."""
+
+    def test_stats_reused_within_ttl(self, monkeypatch):
+        """Test polls within the TTL skip recomputation."""
+        node = ARIANode(node_id="stats-cache")
+        calls = []
+        verify = node.ledger.verify_chain
+        monkeypatch.setattr(node.ledger, "verify_chain",
+                            lambda: calls.append(1) or verify())
+
+        first = node.get_stats()
+        assert node.get_stats() is first
+        assert len(calls) == 1
+
+        node._stats_cache = (node._stats_cache[0] - node.STATS_CACHE_TTL, first)
+        assert node.get_stats() is not first
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_start_refreshes_stats(self):
+        """Test starting the node is visible immediately."""
+        node = ARIANode(node_id="stats-start", port=19012)
+        assert node.get_stats()["is_running"] is False
+
+        await node.start()
+        assert node.get_stats()["is_running"] is True
+        await node.stop()
+
+
+class TestContributionScore:
+    """Tests for the contribution score formula."""
+
+    def test_fast_efficient_inference_scores_highest(self):
+        """Test quality and efficiency are capped at their maxima."""
+        assert contribution_score(500, 10) == pytest.approx(0.001 * 1.0 * 2.0)
+
+    def test_slow_wasteful_inference_hits_floors(self):
+        """Test quality floors at 0.1 and efficiency at 0.5."""
+        assert contribution_score(10000, 10000) == pytest.approx(0.001 * 0.1 * 0.5)
+
+    def test_unknown_energy_is_neutral(self):
+        """Test zero energy gives a neutral efficiency factor."""
+        assert contribution_score(3000, 0) == pytest.approx(0.001 * 0.5)
@@ -1,7 +1,12 @@
 """Tests for the ARIA proof module."""
 
+import hashlib
+import json
+import os
+import platform
 import pytest
 import time
+from dataclasses import asdict
 from aria.proof import UsefulWorkProof, ProofOfUsefulWork, SobrietyAttestation, ProofOfSobriety
 
 
@@ -44,6 +49,21 @@ class TestUsefulWorkProof:
         assert hash1 == hash2
         assert len(hash1) == 64
 
+    def test_proof_hash_matches_sha256_of_canonical_json(self):
+        """Test the proof hash stays plain SHA-256 over sorted-key JSON."""
+        proof = UsefulWorkProof(
+            node_id="node1",
+            inference_id="inf1",
+            query_hash="abc",
+            output_hash="def",
+            model_id="aria-2b-1bit",
+            energy_mj=50,
+            latency_ms=100,
+            timestamp=1700000000.0
+        )
+        data = json.dumps(asdict(proof), sort_keys=True).encode()
+        assert proof.compute_proof_hash() == hashlib.sha256(data).hexdigest()
+
     def test_proof_verify_valid(self):
         """Test verifying a valid proof."""
         proof = UsefulWorkProof(
@@ -189,6 +209,104 @@ class TestProofOfUsefulWork:
         producer = pouw.select_top_contributor()
         assert producer == "node1"
 
+    def test_replayed_proof_rejected(self):
+        """Test the same inference cannot be credited twice."""
+        pouw = ProofOfUsefulWork(difficulty=2)
+        proof = pouw.create_proof(
+            node_id="node1",
+            inference_id="inf-123",
+            query_hash="abc123",
+            output_hash="def456",
+            model_id="aria-2b-1bit",
+            energy_mj=50,
+            latency_ms=100
+        )
+
+        assert pouw.submit_proof(proof) is True
+        assert pouw.submit_proof(proof) is False
+        assert pouw.verified_count == 1
+        assert pouw.rejected_count == 1
+
+    def test_retained_proofs_bounded(self):
+        """Test only the most recent proofs are kept."""
+        pouw = ProofOfUsefulWork(difficulty=2, max_proofs=3)
+        for i in range(5):
+            pouw.submit_proof(pouw.create_proof(
+                node_id="node1",
+                inference_id=f"inf-{i}",
+                query_hash=f"query{i}",
+                output_hash=f"output{i}",
+                model_id="aria-2b-1bit",
+                energy_mj=50,
+                latency_ms=100
+            ))
+
+        assert pouw.verified_count == 5
+        assert pouw.cache_size == 3
+        assert [key[1] for key in pouw.proofs] == ["inf-2", "inf-3", "inf-4"]
+
+    def test_max_proofs_zero_keeps_nothing(self):
+        """Test an explicit max_proofs=0 is honoured, not replaced by the default."""
+        pouw = ProofOfUsefulWork(difficulty=2, max_proofs=0)
+        assert pouw.submit_proof(pouw.create_proof(
+            node_id="node1",
+            inference_id="inf-0",
+            query_hash="query",
+            output_hash="output",
+            model_id="aria-2b-1bit",
+            energy_mj=50,
+            latency_ms=100
+        )) is True
+
+        assert pouw.max_proofs == 0
+        assert pouw.cache_size == 0
+
+    def test_negative_max_proofs_rejected(self):
+        """Test a negative retention limit raises."""
+        with pytest.raises(ValueError):
+            ProofOfUsefulWork(max_proofs=-1)
+
+    def test_top_contributor_follows_retained_proofs(self):
+        """Test evicted proofs stop counting towards the top contributor."""
+        pouw = ProofOfUsefulWork(difficulty=2, max_proofs=3)
+        for i, node_id in enumerate(["node1", "node1", "node2", "node2", "node2"]):
+            pouw.submit_proof(pouw.create_proof(
+                node_id=node_id,
+                inference_id=f"inf-{i}",
+                query_hash=f"query{i}",
+                output_hash=f"output{i}",
+                model_id="aria-2b-1bit",
+                energy_mj=50,
+                latency_ms=100
+            ))
+
+        assert pouw.select_top_contributor() == "node2"
+        assert pouw._work_count == {"node2": 3}
+
+    def test_submit_proofs_batch(self):
+        """Test batch submission matches one-at-a-time acceptance."""
+        pouw = ProofOfUsefulWork(difficulty=2, max_proofs=3)
+        proofs = [
+            pouw.create_proof(
+                node_id="node1",
+                inference_id=f"inf-{i}",
+                query_hash=f"query{i}",
+                output_hash=f"output{i}",
+                model_id="aria-2b-1bit",
+                energy_mj=-1 if i == 1 else 50,
+                latency_ms=100
+            )
+            for i in range(5)
+        ]
+        proofs.append(proofs[0])
+
+        accepted = pouw.submit_proofs(proofs)
+
+        assert accepted == [True, False, True, True, True, False]
+        assert pouw.verified_count == 4
+        assert pouw.rejected_count == 2
+        assert [key[1] for key in pouw.proofs] == ["inf-2", "inf-3", "inf-4"]
+
 
 class TestSobrietyAttestation:
     """Tests for SobrietyAttestation dataclass."""
@@ -261,6 +379,28 @@ class TestSobrietyAttestation:
         )
         assert attestation.efficiency_rating == "A (Excellent)"
 
+    @pytest.mark.parametrize("energy_mj,rating", [
+        (0, "N/A"),
+        (29, "A+ (Exceptional)"),
+        (30, "A (Excellent)"),
+        (50, "B (Good)"),
+        (100, "C (Average - GPU baseline)"),
+        (149, "C (Average - GPU baseline)"),
+        (150, "D (Below average)"),
+    ])
+    def test_efficiency_rating_boundaries(self, energy_mj, rating):
+        """Test each rating band starts exactly at its threshold."""
+        attestation = SobrietyAttestation(
+            node_id="node1",
+            period_start=0,
+            period_end=100,
+            total_inferences=1,
+            total_energy_mj=energy_mj,
+            hardware_type="Intel",
+            os_info="Linux"
+        )
+        assert attestation.efficiency_rating == rating
+
     def test_attestation_to_hash(self):
         """Test attestation hash generation."""
         attestation = SobrietyAttestation(
@@ -278,6 +418,20 @@ class TestSobrietyAttestation:
         assert hash1 == hash2
         assert len(hash1) == 64
 
+    def test_attestation_hash_matches_sha256_of_canonical_json(self):
+        """Test the fast serializer matches json.dumps for attestations."""
+        attestation = SobrietyAttestation(
+            node_id="nœud-\"1\"",
+            period_start=1700000000.25,
+            period_end=1700000100.5,
+            total_inferences=100,
+            total_energy_mj=5000,
+            hardware_type="Intel® Core™",
+            os_info="Linux"
+        )
+        data = json.dumps(asdict(attestation), sort_keys=True).encode()
+        assert attestation.to_hash() == hashlib.sha256(data).hexdigest()
+
 
 class TestProofOfSobriety:
     """Tests for ProofOfSobriety class."""
@@ -310,6 +464,46 @@ class TestProofOfSobriety:
         assert attestation.node_id == "node1"
         assert len(pos.attestations) == 1
 
+    @pytest.mark.skipif(not hasattr(os, "pread"), reason="os.pread unavailable")
+    def test_energy_counter_reads_persistent_fd(self, tmp_path, monkeypatch):
+        """Test the RAPL counter is opened once and re-read in place."""
+        counter = tmp_path / "energy_uj"
+        counter.write_text("5000000\n")
+        monkeypatch.setattr(ProofOfSobriety, "RAPL_PATH", str(counter))
+        pos = ProofOfSobriety(node_id="node1")
+        fd = pos._rapl_fd
+
+        assert pos._read_energy_counter() == 5000.0
+        counter.write_text("7500000\n")
+        assert pos._read_energy_counter() == 7500.0
+        assert pos._rapl_fd == fd
+
+        pos.close()
+        assert pos._rapl_fd is None
+        assert pos._read_energy_counter() is None
+
+    def test_energy_counter_unavailable(self, tmp_path, monkeypatch):
+        """Test a missing RAPL counter falls back to estimation."""
+        monkeypatch.setattr(ProofOfSobriety, "RAPL_PATH", str(tmp_path / "missing"))
+        pos = ProofOfSobriety(node_id="node1")
+
+        assert pos._read_energy_counter() is None
+        pos.start_measurement()
+        assert pos.end_measurement(inferences_done=10).total_energy_mj >= 280
+
+    def test_host_info_cached_across_attestations(self):
+        """Test hardware and OS detection run once per process."""
+        ProofOfSobriety._get_hardware_type.cache_clear()
+        pos = ProofOfSobriety(node_id="node1")
+        for _ in range(3):
+            pos.start_measurement()
+            attestation = pos.end_measurement(inferences_done=1)
+
+        info = ProofOfSobriety._get_hardware_type.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+        assert attestation.os_info == f"{platform.system()} {platform.release()}"
+
     def test_end_measurement_without_start(self):
         """Test ending measurement without starting raises error."""
         pos = ProofOfSobriety(node_id="node1")
@@ -343,3 +537,4 @@ class TestProofOfSobriety:
 
         savings = pos.get_network_savings()
         assert savings["total_inferences"] == 30
+        assert savings["aria_energy_mj"] == sum(a.total_energy_mj for a in pos.attestations)